@@ -0,0 +1,61 @@
+from flask import request, jsonify, make_response
+from flask_restx import Resource, Namespace
+from decorators import token_required
+from api.auth import require_admin
+from utils.config import Config
+from utils.slow_query_log import get_slow_queries, clear_slow_queries
+
+admin_ns = Namespace('admin', description='Diagnóstico e manutenção (somente administradores)')
+
+
+@admin_ns.route('/slow-queries')
+class SlowQueries(Resource):
+    """Amostras do log de consultas lentas"""
+
+    @token_required
+    @admin_ns.doc('list_slow_queries', params={'limit': 'Quantidade máxima de amostras (mais recentes primeiro)'})
+    @admin_ns.response(200, 'Amostras de consultas lentas')
+    @admin_ns.response(403, 'Não autorizado')
+    def get(self, current_user_id):
+        """Lista as consultas lentas recentes e os planos (EXPLAIN) capturados"""
+        try:
+            if not require_admin(current_user_id):
+                return make_response(jsonify({'success': False, 'message': 'Não autorizado'}), 403)
+
+            limit = request.args.get('limit', type=int)
+            slow_queries = get_slow_queries(limit)
+            return make_response(jsonify({
+                'success': True,
+                'threshold_ms': Config.SLOW_QUERY_THRESHOLD_MS,
+                'explain_enabled': Config.SLOW_QUERY_EXPLAIN,
+                'samples': slow_queries['samples'],
+                'explains': slow_queries['explains'],
+                'total': len(slow_queries['samples'])
+            }), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao buscar consultas lentas',
+                'error': str(e)
+            }), 500)
+
+    @token_required
+    @admin_ns.doc('clear_slow_queries')
+    @admin_ns.response(200, 'Amostras descartadas')
+    @admin_ns.response(403, 'Não autorizado')
+    def delete(self, current_user_id):
+        """Descarta as amostras e os planos guardados"""
+        try:
+            if not require_admin(current_user_id):
+                return make_response(jsonify({'success': False, 'message': 'Não autorizado'}), 403)
+
+            clear_slow_queries()
+            return make_response(jsonify({'success': True, 'message': 'Log de consultas lentas limpo'}), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao limpar consultas lentas',
+                'error': str(e)
+            }), 500)
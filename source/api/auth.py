@@ -1,6 +1,6 @@
 import datetime
 import os
-from flask import request, jsonify, make_response
+from flask import request, jsonify, make_response, Response, stream_with_context, current_app
 from flask_restx import Resource, Namespace, fields
 from werkzeug.security import generate_password_hash, check_password_hash
 from models.user_model import User
@@ -82,6 +82,41 @@ def require_admin(user_id):
     return True
 
 
+def generate_users_json(first_user, users):
+    """
+    Gera a listagem de usuários em JSON aos poucos
+
+    Mantém as chaves 'users', 'total' e 'success' da listagem anterior;
+    success e total são escritos ao final. Se o banco falhar no meio do
+    streaming (o status 200 já foi enviado), o documento é fechado com
+    success false e a chave 'error', continuando um JSON válido.
+
+    Args:
+        first_user (dict): Primeiro usuário, já lido antes da resposta (ou None)
+        users (iterator): Restante de User.iter_all()
+    """
+    yield '{"users": ['
+    total = 0
+    error = None
+    try:
+        if first_user is not None:
+            yield current_app.json.dumps(first_user)
+            total = 1
+            for user in users:
+                yield ',' + current_app.json.dumps(user)
+                total += 1
+    except Exception as e:
+        print(f"[ERROR] generate_users_json: {e}")
+        error = str(e)
+    finally:
+        users.close()
+
+    if error is None:
+        yield f'], "total": {total}, "success": true}}'
+    else:
+        yield f'], "total": {total}, "success": false, "error": {current_app.json.dumps(error)}}}'
+
+
 @auth_ns.route('/users')
 class AdminUsers(Resource):
     """Admin: listar e criar usuários"""
@@ -91,8 +126,18 @@ class AdminUsers(Resource):
         """Lista todos os usuários"""
         if not require_admin(current_user_id):
             return make_response(jsonify({'success': False, 'message': 'Não autorizado'}), 403)
-        users = User.get_all()
-        return make_response(jsonify({'success': True, 'users': users, 'total': len(users)}), 200)
+        # Lê o primeiro usuário antes de responder: falhas de conexão ou de
+        # consulta ainda viram 500 em vez de um 200 truncado
+        users = User.iter_all()
+        try:
+            first_user = next(users, None)
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao buscar usuários',
+                'error': str(e)
+            }), 500)
+        return Response(stream_with_context(generate_users_json(first_user, users)), mimetype='application/json')
 
     @token_required
     @auth_ns.expect(user_create_model)
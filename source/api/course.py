@@ -3,7 +3,9 @@ from flask_restx import Resource, Namespace, fields
 from decorators import token_required
 from models.course_model import Course
 from datetime import datetime
-from utils.request_utils import get_json_data
+from utils.etag_utils import make_etag, not_modified_response, with_etag
+from utils.cache import bypass_entity_cache
+from utils.request_utils import get_json_data, get_keyset_page_args, build_next_cursor
 from utils.signature_utils import save_signature_file, delete_signature_file, get_signatures_upload_dir
 import os
 
@@ -42,7 +44,9 @@ course_search_model = course_ns.model('CourseSearch', {
     'name': fields.String(description='Nome do curso para buscar'),
     'start_date': fields.String(description='Data inicial (YYYY-MM-DD)'),
     'end_date': fields.String(description='Data final (YYYY-MM-DD)'),
-    'status': fields.String(description='Status', enum=['ativo', 'inativo', 'all'])
+    'status': fields.String(description='Status', enum=['ativo', 'inativo', 'all']),
+    'limit': fields.Integer(description='Tamanho da página (paginação keyset por data de cadastro)'),
+    'cursor': fields.Raw(description='next_cursor retornado pela página anterior')
 })
 
 course_statistics_model = course_ns.model('CourseStatistics', {
@@ -58,7 +62,7 @@ def format_course_response(course_data):
     Formata os dados do curso para resposta da API
 
     Args:
-        course_data (tuple): Tupla com dados do curso do banco
+        course_data (CourseRow): Linha do curso do banco
 
     Returns:
         dict: Dicionário formatado
@@ -66,14 +70,14 @@ def format_course_response(course_data):
     if not course_data:
         return None
     return {
-        'id': course_data[0],
-        'name': course_data[1],
-        'observation': course_data[2],
-        'status': course_data[3],
-        'created_at': course_data[4].isoformat() if course_data[4] else None,
-        'updated_at': course_data[5].isoformat() if course_data[5] else None,
-        'responsible_teacher_name': course_data[6] if len(course_data) > 6 else None,
-        'responsible_signature_url': course_data[7] if len(course_data) > 7 else None
+        'id': course_data.id,
+        'name': course_data.name,
+        'observation': course_data.observation,
+        'status': course_data.status,
+        'created_at': course_data.created_at,
+        'updated_at': course_data.updated_at,
+        'responsible_teacher_name': course_data.responsible_teacher_name,
+        'responsible_signature_url': course_data.responsible_signature_url
     }
 
 
@@ -419,22 +423,36 @@ class CourseDetail(Resource):
     @token_required
     @course_ns.doc('get_course', description='Busca um curso por ID')
     @course_ns.response(200, 'Curso encontrado', course_model)
+    @course_ns.response(304, 'Não modificado (If-None-Match)')
     @course_ns.response(404, 'Curso não encontrado')
     def get(self, current_user_id, course_id):
         """Busca um curso específico por ID"""
         try:
-            course = Course.select_course_by_id(course_id)
+            version = Course.get_version(course_id)
+            if not version:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Curso não encontrado'
+                }), 404)
 
+            etag = make_etag('course', course_id, version)
+            not_modified = not_modified_response(etag)
+            if not_modified:
+                return not_modified
+
+            bypass_entity_cache()
+
+            course = Course.select_course_by_id(course_id)
             if not course:
                 return make_response(jsonify({
                     'success': False,
                     'message': 'Curso não encontrado'
                 }), 404)
 
-            return make_response(jsonify({
+            return with_etag(make_response(jsonify({
                 'success': True,
                 'course': format_course_response(course)
-            }), 200)
+            }), 200), etag)
 
         except Exception as e:
             return make_response(jsonify({
@@ -461,19 +479,32 @@ class CourseSearch(Resource):
             start_date = data.get('start_date')
             end_date = data.get('end_date')
             status = data.get('status', 'ativo')
+
+            try:
+                limit, after = get_keyset_page_args(data)
+            except (TypeError, ValueError) as e:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Paginação inválida',
+                    'error': str(e)
+                }), 400)
+
             if name:
+                limit = None
                 courses = Course.select_courses_by_name(name)
-            elif start_date or end_date:
-                courses = Course.select_courses_by_date_range(start_date, end_date, status)
+            elif start_date or end_date or limit:
+                courses = Course.select_courses_by_date_range(start_date, end_date, status, limit, after)
             else:
                 courses = Course.select_all_courses(status)
+            courses = courses if courses and courses not in (0, "0") else []
 
             response = [format_course_response(course) for course in courses]
 
             return make_response(jsonify({
                 'success': True,
                 'courses': response,
-                'total': len(response)
+                'total': len(response),
+                'next_cursor': build_next_cursor(courses, limit, 4)
             }), 200)
 
         except Exception as e:
@@ -495,9 +526,6 @@ class CourseStatistics(Resource):
         """Retorna estatísticas dos cursos"""
         try:
             stats = Course.get_course_statistics()
-            if stats['ultimo_cadastro']:
-                stats['ultimo_cadastro'] = stats['ultimo_cadastro'].isoformat()
-
             return make_response(jsonify({
                 'success': True,
                 'statistics': stats
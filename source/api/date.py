@@ -1,9 +1,13 @@
-from flask import request, jsonify, make_response
+from flask import request, jsonify, make_response, Response, stream_with_context
 from flask_restx import Resource, Namespace, fields
 from decorators import token_required
+from utils.config import Config
+from utils.jwt_utils import encode_jwt, decode_jwt
 from utils.request_utils import get_json_data
 from models.date_model import DateStatus
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from werkzeug.http import http_date
 
 date_status_ns = Namespace('date-status', description='Gerenciamento de status de datas')
 
@@ -29,6 +33,21 @@ date_status_delete_model = date_status_ns.model('DateStatusDelete', {
     'date': fields.String(required=True, description='Data (YYYY-MM-DD)')
 })
 
+date_status_range_model = date_status_ns.model('DateStatusRange', {
+    'start': fields.String(required=True, description='Data inicial (YYYY-MM-DD)'),
+    'end': fields.String(required=True, description='Data final, inclusiva (YYYY-MM-DD)'),
+    'status': fields.Integer(required=True, description='Status (1, 2, 3, 4, 5 ou 6)', min=1, max=6),
+    'skip_weekends': fields.Boolean(description='Ignora sábados e domingos do intervalo', default=False)
+})
+
+date_status_bulk_model = date_status_ns.model('DateStatusBulk', {
+    'statuses': fields.Raw(description='Mapa {YYYY-MM-DD: status}; sobrescreve os intervalos'),
+    'ranges': fields.List(fields.Nested(date_status_range_model), description='Intervalos de datas com um mesmo status')
+})
+
+# Limite de datas por requisição em lote (~10 anos)
+MAX_BULK_DATES = 3660
+
 date_status_statistics_model = date_status_ns.model('DateStatusStatistics', {
     'total': fields.Integer(description='Total de datas com status'),
     'status_1': fields.Integer(description='Total com status 1'),
@@ -52,10 +71,10 @@ def format_date_status_response(status_data):
     """
     return {
         'id': status_data[0],
-        'date': status_data[1].isoformat() if hasattr(status_data[1], 'isoformat') else str(status_data[1]),
+        'date': status_data[1],
         'status': status_data[2],
-        'created_at': status_data[3].isoformat() if status_data[3] else None,
-        'updated_at': status_data[4].isoformat() if status_data[4] else None
+        'created_at': status_data[3],
+        'updated_at': status_data[4]
     }
 
 
@@ -248,6 +267,125 @@ class DateStatusList(Resource):
             }), 500)
 
 
+def parse_bulk_date_statuses(data):
+    """
+    Valida e expande o payload de gravação em lote em uma única passada
+
+    Os intervalos são aplicados na ordem recebida e o mapa 'statuses'
+    é aplicado por último, sobrescrevendo datas repetidas.
+
+    Args:
+        data (dict): Payload com 'statuses' e/ou 'ranges'
+
+    Returns:
+        tuple: (lista de tuplas (YYYY-MM-DD, status), lista de erros)
+    """
+    resolved = {}
+    errors = []
+
+    ranges = data.get('ranges') or []
+    if not isinstance(ranges, list):
+        errors.append({'field': 'ranges', 'message': 'ranges deve ser uma lista'})
+        ranges = []
+
+    for index, item in enumerate(ranges):
+        if not isinstance(item, dict):
+            errors.append({'field': f'ranges[{index}]', 'message': 'Intervalo inválido'})
+            continue
+        start_str = item.get('start')
+        end_str = item.get('end')
+        status = item.get('status')
+        if not isinstance(start_str, str) or not validate_date_format(start_str) \
+                or not isinstance(end_str, str) or not validate_date_format(end_str):
+            errors.append({'field': f'ranges[{index}]', 'message': 'Datas devem estar no formato YYYY-MM-DD'})
+            continue
+        if isinstance(status, bool) or status not in range(1, 7):
+            errors.append({'field': f'ranges[{index}]', 'message': 'Status deve estar entre 1 e 6'})
+            continue
+        start = datetime.strptime(start_str, '%Y-%m-%d').date()
+        end = datetime.strptime(end_str, '%Y-%m-%d').date()
+        if end < start:
+            errors.append({'field': f'ranges[{index}]', 'message': 'Data final anterior à data inicial'})
+            continue
+        if (end - start).days + 1 > MAX_BULK_DATES:
+            errors.append({'field': f'ranges[{index}]', 'message': f'Intervalo excede {MAX_BULK_DATES} dias'})
+            continue
+        skip_weekends = bool(item.get('skip_weekends', False))
+        current = start
+        while current <= end:
+            if not (skip_weekends and current.weekday() >= 5):
+                resolved[current.isoformat()] = status
+            current += timedelta(days=1)
+
+    statuses = data.get('statuses') or {}
+    if not isinstance(statuses, dict):
+        errors.append({'field': 'statuses', 'message': 'statuses deve ser um objeto {data: status}'})
+        statuses = {}
+
+    for date_str, status in statuses.items():
+        if not validate_date_format(date_str):
+            errors.append({'field': date_str, 'message': 'Data deve estar no formato YYYY-MM-DD'})
+            continue
+        if isinstance(status, bool) or status not in range(1, 7):
+            errors.append({'field': date_str, 'message': 'Status deve estar entre 1 e 6'})
+            continue
+        resolved[datetime.strptime(date_str, '%Y-%m-%d').date().isoformat()] = status
+
+    if len(resolved) > MAX_BULK_DATES:
+        errors.append({'field': None, 'message': f'Máximo de {MAX_BULK_DATES} datas por requisição'})
+
+    return sorted(resolved.items()), errors
+
+
+@date_status_ns.route('/bulk')
+class DateStatusBulk(Resource):
+    """Endpoint para gravação em lote de status de datas"""
+
+    @token_required
+    @date_status_ns.doc('bulk_upsert_date_statuses')
+    @date_status_ns.expect(date_status_bulk_model)
+    @date_status_ns.response(200, 'Status de datas gravados com sucesso')
+    @date_status_ns.response(400, 'Dados inválidos')
+    def post(self, current_user_id):
+        """Cria ou atualiza vários status de datas em uma única transação"""
+        try:
+            data = get_json_data()
+
+            if not data or ('statuses' not in data and 'ranges' not in data):
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Informe statuses e/ou ranges'
+                }), 400)
+
+            statuses, errors = parse_bulk_date_statuses(data)
+
+            if errors:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Dados inválidos',
+                    'errors': errors
+                }), 400)
+
+            if DateStatus.bulk_upsert_date_statuses(statuses):
+                return make_response(jsonify({
+                    'success': True,
+                    'message': 'Status de datas gravados com sucesso!',
+                    'total': len(statuses)
+                }), 200)
+            else:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao gravar status de datas'
+                }), 500)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao gravar status de datas',
+                'error': str(e)
+            }), 500)
+
+
 @date_status_ns.route('/year/<int:year>')
 class DateStatusYear(Resource):
     """Endpoints para operações específicas de um ano"""
@@ -258,7 +396,7 @@ class DateStatusYear(Resource):
     def get(self, current_user_id, year):
         """Retorna todos os status de datas de um ano em formato dicionário"""
         try:
-            statuses = DateStatus.get_statuses_for_year(year)
+            statuses = DateStatus.get_cached_statuses_for_year(year)
 
             return make_response(jsonify({
                 'success': True,
@@ -305,6 +443,91 @@ class DateStatusYear(Resource):
             }), 500)
 
 
+# Máximo de anos consultados de uma vez nos endpoints de intervalo
+MAX_YEAR_SPAN = 20
+
+
+def validate_year_range(start_year, end_year):
+    """Valida um intervalo de anos; retorna mensagem de erro ou None"""
+    if end_year < start_year:
+        return 'Ano final deve ser maior ou igual ao ano inicial'
+    if end_year - start_year + 1 > MAX_YEAR_SPAN:
+        return f'Intervalo máximo de {MAX_YEAR_SPAN} anos'
+    return None
+
+
+@date_status_ns.route('/years/<int:start_year>/<int:end_year>')
+class DateStatusYearRange(Resource):
+    """Endpoints para consultas em um intervalo de anos"""
+
+    @token_required
+    @date_status_ns.doc('get_year_range_statuses')
+    @date_status_ns.response(200, 'Statuses dos anos em formato dicionário')
+    @date_status_ns.response(400, 'Intervalo inválido')
+    def get(self, current_user_id, start_year, end_year):
+        """Retorna os status de datas de um intervalo de anos, agrupados por ano"""
+        try:
+            error = validate_year_range(start_year, end_year)
+            if error:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': error
+                }), 400)
+
+            by_year = DateStatus.get_statuses_for_year_range(start_year, end_year)
+            years = {str(year): by_year.get(year, {}) for year in range(start_year, end_year + 1)}
+
+            return make_response(jsonify({
+                'success': True,
+                'start_year': start_year,
+                'end_year': end_year,
+                'years': years,
+                'total': sum(len(statuses) for statuses in years.values())
+            }), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao buscar status dos anos',
+                'error': str(e)
+            }), 500)
+
+
+@date_status_ns.route('/years/<int:start_year>/<int:end_year>/statistics')
+class DateStatusYearRangeStatistics(Resource):
+    """Endpoints para estatísticas em um intervalo de anos"""
+
+    @token_required
+    @date_status_ns.doc('get_year_range_statistics')
+    @date_status_ns.response(200, 'Estatísticas do intervalo de anos', date_status_statistics_model)
+    @date_status_ns.response(400, 'Intervalo inválido')
+    def get(self, current_user_id, start_year, end_year):
+        """Retorna estatísticas dos status de datas de um intervalo de anos"""
+        try:
+            error = validate_year_range(start_year, end_year)
+            if error:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': error
+                }), 400)
+
+            stats = DateStatus.get_date_status_statistics_by_year_range(start_year, end_year)
+
+            return make_response(jsonify({
+                'success': True,
+                'start_year': start_year,
+                'end_year': end_year,
+                'statistics': stats
+            }), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao buscar estatísticas',
+                'error': str(e)
+            }), 500)
+
+
 @date_status_ns.route('/statistics')
 class DateStatusStatistics(Resource):
     """Endpoints para estatísticas de status de datas"""
@@ -317,7 +540,10 @@ class DateStatusStatistics(Resource):
         """Retorna estatísticas dos status de datas"""
         try:
             year = request.args.get('year', type=int)
-            stats = DateStatus.get_date_status_statistics(year)
+            if year:
+                stats = DateStatus.get_cached_statistics_for_year(year)
+            else:
+                stats = DateStatus.get_date_status_statistics()
 
             return make_response(jsonify({
                 'success': True,
@@ -366,6 +592,189 @@ class DateStatusByStatus(Resource):
             }), 500)
 
 
+def escape_ics_text(value):
+    """Escapa texto conforme RFC 5545 (barra, vírgula, ponto e vírgula e quebra de linha)"""
+    return str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def to_utc(value):
+    """
+    Converte um datetime do MySQL para UTC
+
+    TIMESTAMP volta do driver sem fuso, na hora local do servidor;
+    astimezone() em um datetime ingênuo assume justamente esse fuso.
+    """
+    return value.astimezone(timezone.utc) if value else None
+
+
+def generate_ics(statuses, calendar_name, dtstamp):
+    """
+    Gera o iCalendar linha a linha, um evento de dia inteiro por data
+
+    Args:
+        statuses (iterable): Tuplas de status de datas (id, date, status, ...)
+        calendar_name (str): Nome exibido do calendário
+        dtstamp (str): Carimbo DTSTAMP em UTC (YYYYMMDDTHHMMSSZ)
+
+    Yields:
+        str: Linhas do arquivo .ics terminadas em CRLF
+    """
+    yield 'BEGIN:VCALENDAR\r\n'
+    yield 'VERSION:2.0\r\n'
+    yield 'PRODID:-//GradMate//Calendario Academico//PT\r\n'
+    yield 'CALSCALE:GREGORIAN\r\n'
+    yield f'X-WR-CALNAME:{escape_ics_text(calendar_name)}\r\n'
+    for status_data in statuses:
+        day = status_data[1]
+        next_day = day + timedelta(days=1)
+        yield 'BEGIN:VEVENT\r\n'
+        yield f'UID:date-status-{status_data[0]}@gradmate\r\n'
+        yield f'DTSTAMP:{dtstamp}\r\n'
+        yield f'DTSTART;VALUE=DATE:{day.strftime("%Y%m%d")}\r\n'
+        yield f'DTEND;VALUE=DATE:{next_day.strftime("%Y%m%d")}\r\n'
+        yield f'SUMMARY:Status {status_data[2]}\r\n'
+        yield f'CATEGORIES:STATUS-{status_data[2]}\r\n'
+        yield 'TRANSP:TRANSPARENT\r\n'
+        yield 'END:VEVENT\r\n'
+    yield 'END:VCALENDAR\r\n'
+
+
+FEED_TOKEN_SCOPE = 'calendar-feed'
+
+
+def make_feed_token(user_id):
+    """
+    Gera o token do feed de calendário de um usuário
+
+    Apps de calendário não enviam o header Authorization, então o feed é
+    autenticado por um token na query string. Ele é assinado com
+    CALENDAR_FEED_SECRET_KEY: não serve como token de login e o token de
+    login não abre o feed.
+
+    Args:
+        user_id (int): ID do usuário
+
+    Returns:
+        str: Token do feed
+    """
+    return encode_jwt({'id': user_id, 'scope': FEED_TOKEN_SCOPE}, Config.CALENDAR_FEED_SECRET_KEY)
+
+
+def decode_feed_token(token):
+    """
+    Valida o token do feed de calendário
+
+    Args:
+        token (str): Token recebido em ?token=
+
+    Returns:
+        int: ID do usuário ou None se o token for inválido
+    """
+    try:
+        data = decode_jwt(token, Config.CALENDAR_FEED_SECRET_KEY)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get('scope') != FEED_TOKEN_SCOPE:
+        return None
+    return data.get('id')
+
+
+@date_status_ns.route('/feed/token')
+class DateStatusFeedToken(Resource):
+    """Token de acesso ao feed iCalendar"""
+
+    @token_required
+    @date_status_ns.doc('get_date_status_feed_token')
+    @date_status_ns.response(200, 'Token do feed')
+    def get(self, current_user_id):
+        """Retorna o token do usuário para assinar o feed .ics em apps de calendário"""
+        try:
+            return make_response(jsonify({
+                'success': True,
+                'token': make_feed_token(current_user_id),
+                'message': 'Use o token em /date-status/feed/<ano>.ics?token=...'
+            }), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao gerar token do calendário',
+                'error': str(e)
+            }), 500)
+
+
+@date_status_ns.route('/feed/<int:year>.ics')
+class DateStatusFeed(Resource):
+    """Feed iCalendar dos status de datas"""
+
+    @date_status_ns.doc('get_date_status_feed')
+    @date_status_ns.param('token', 'Token do feed (GET /date-status/feed/token)', _in='query', required=True)
+    @date_status_ns.param('status', 'Status para filtrar (1 a 6)', _in='query', type='int')
+    @date_status_ns.response(200, 'Arquivo .ics')
+    @date_status_ns.response(304, 'Não modificado')
+    @date_status_ns.response(403, 'Token ausente ou inválido')
+    def get(self, year):
+        """
+        Exporta os status de um ano em iCalendar
+
+        Autenticado pelo token do feed na query string (ver
+        DateStatusFeedToken), já que apps de calendário não enviam o
+        header Authorization.
+        """
+        try:
+            token = request.args.get('token')
+            if not token:
+                return make_response(jsonify({'message': 'Token is missing!'}), 403)
+            if decode_feed_token(token) is None:
+                return make_response(jsonify({'message': 'Token is invalid!'}), 403)
+
+            status = request.args.get('status', type=int)
+            if status is not None and status not in [1, 2, 3, 4, 5, 6]:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Status deve estar entre 1 e 6'
+                }), 400)
+
+            start_date = f'{year:04d}-01-01'
+            end_date = f'{year:04d}-12-31'
+            last_modified, total = DateStatus.get_feed_version(start_date, end_date, status)
+            last_modified = to_utc(last_modified)
+            modified_ts = int(last_modified.timestamp()) if last_modified else 0
+            etag = f'{year}-{status or "all"}-{total}-{modified_ts}'
+
+            if request.if_none_match.contains_weak(etag) or (
+                    not request.if_none_match and last_modified and request.if_modified_since
+                    and request.if_modified_since >= last_modified.replace(microsecond=0)):
+                response = make_response('', 304)
+            else:
+                # A primeira linha é lida aqui: uma falha na consulta vira 500
+                # em vez de um .ics truncado com status 200
+                statuses = DateStatus.stream_date_statuses_by_date_range(start_date, end_date, status)
+                first = next(statuses, None)
+                if first is not None:
+                    statuses = chain((first,), statuses)
+                name = f'GradMate {year}' + (f' - Status {status}' if status else '')
+                dtstamp = (last_modified or datetime.now(timezone.utc)).strftime('%Y%m%dT%H%M%SZ')
+                response = Response(
+                    stream_with_context(generate_ics(statuses, name, dtstamp)),
+                    mimetype='text/calendar'
+                )
+                response.headers['Content-Disposition'] = f'inline; filename="gradmate-{year}.ics"'
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.headers['Last-Modified'] = http_date(last_modified)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao gerar calendário',
+                'error': str(e)
+            }), 500)
+
+
 def confirm_year_deletion(year):
     confirmation = request.args.get('confirm', type=str)
     return confirmation == 'true'
@@ -1,4 +1,4 @@
-from flask import request, jsonify, make_response, send_file
+from flask import request, jsonify, make_response, send_file, Response, stream_with_context, current_app
 from flask_restx import Resource, Namespace, fields
 from decorators import token_required
 from models.project_model import Project
@@ -20,7 +20,12 @@ import os
 import uuid
 from urllib.parse import quote
 import json
+import csv
+import io
+from utils.etag_utils import make_etag, not_modified_response, with_etag
+from utils.cache import bypass_entity_cache
 from utils.request_utils import get_json_data
+from api.auth import require_admin
 
 project_ns = Namespace('project', description='Gerenciamento de projetos TCC')
 
@@ -67,8 +72,8 @@ def format_ata_response(row):
         'title': row[4],
         'result': row[5],
         'location': row[6],
-        'started_at': row[7].isoformat() if row[7] else None,
-        'created_at': row[8].isoformat() if row[8] else None,
+        'started_at': row[7],
+        'created_at': row[8],
         'created_by': row[9]
     }
 
@@ -156,7 +161,7 @@ def format_file_response(row):
         'mime_type': row[4],
         'size': row[5],
         'uploaded_by': row[6],
-        'created_at': row[7].isoformat() if row[7] else None
+        'created_at': row[7]
     }
 
 
@@ -169,35 +174,117 @@ def get_project_upload_dir(project_id: int) -> str:
     os.makedirs(path, exist_ok=True)
     return path
 
+EXPORT_CHUNK_SIZE = 200
+
+EXPORT_CSV_COLUMNS = [
+    'id', 'name', 'description', 'status', 'course_id', 'course', 'observation',
+    'advisors', 'guests', 'students', 'reports', 'last_report_at', 'created_at', 'updated_at'
+]
+
+
+def iter_project_export(status):
+    """
+    Gera os projetos da exportação já com professores, alunos e relatórios
+
+    Os projetos vêm do cursor server-side em blocos de EXPORT_CHUNK_SIZE e
+    as relações de cada bloco são buscadas com uma consulta por tipo.
+
+    Args:
+        status (str): Status dos projetos ou 'all'
+
+    Yields:
+        dict: Projeto com relações
+    """
+    for chunk in Project.stream_projects_for_export(status, EXPORT_CHUNK_SIZE):
+        relations = Project.get_export_relations([row[0] for row in chunk])
+        for row in chunk:
+            related = relations[row[0]]
+            yield {
+                'id': row[0],
+                'name': row[1],
+                'description': row[2],
+                'course': {'id': row[3], 'name': row[4]} if row[3] else None,
+                'observation': row[5],
+                'status': row[6],
+                'teachers': related['advisors'],
+                'guests': related['guests'],
+                'students': related['students'],
+                'reports': related['reports'],
+                'created_at': row[7],
+                'updated_at': row[8]
+            }
+
+
+def generate_project_ndjson(status):
+    """Gera a exportação de projetos em NDJSON, um projeto por linha"""
+    for project in iter_project_export(status):
+        yield current_app.json.dumps(project) + '\n'
+
+
+def csv_datetime(value):
+    """Formata datas do CSV em ISO 8601, como nas respostas JSON"""
+    return value.isoformat() if value else None
+
+
+def generate_project_csv(status):
+    """Gera a exportação de projetos em CSV, um projeto por linha"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    yield '\ufeff' + buffer.getvalue()
+
+    for project in iter_project_export(status):
+        buffer.seek(0)
+        buffer.truncate()
+        course = project['course'] or {}
+        reports = project['reports']
+        writer.writerow([
+            project['id'],
+            project['name'],
+            project['description'],
+            project['status'],
+            course.get('id'),
+            course.get('name'),
+            project['observation'],
+            '; '.join(teacher['name'] for teacher in project['teachers']),
+            '; '.join(guest['name'] for guest in project['guests']),
+            '; '.join(f"{student['name']} ({student['registration']})" for student in project['students']),
+            len(reports),
+            csv_datetime(reports[0]['created_at']) if reports else None,
+            csv_datetime(project['created_at']),
+            csv_datetime(project['updated_at'])
+        ])
+        yield buffer.getvalue()
+
 
 def format_project_response(project_data):
     """
     Formata os dados do projeto para resposta da API
 
     Args:
-        project_data (tuple): Tupla com dados do projeto do banco
+        project_data (ProjectRow): Linha do projeto do banco
 
     Returns:
         dict: Dicionário formatado
     """
     try:
-        teachers = Project.get_project_teachers_by_role(project_data[0], 'advisor')
-        guests = Project.get_project_teachers_by_role(project_data[0], 'guest')
-        students = Student.find_all_by_project(project_data[0])
-        reports = Report.find_all_by_project(project_data[0])
+        teachers = Project.get_project_teachers_by_role(project_data.id, 'advisor')
+        guests = Project.get_project_teachers_by_role(project_data.id, 'guest')
+        students = Student.find_all_by_project(project_data.id)
+        reports = Report.find_all_by_project(project_data.id)
         return {
-            'id': project_data[0],
-            'name': project_data[1],
-            'description': project_data[2],
-            'course': format_course_response(Course.select_course_by_id(project_data[3])),
-            'observation': project_data[4],
-            'status': project_data[5],
+            'id': project_data.id,
+            'name': project_data.name,
+            'description': project_data.description,
+            'course': format_course_response(Course.select_course_by_id(project_data.course_id)),
+            'observation': project_data.observation,
+            'status': project_data.status,
             'teachers': [format_teacher_response(teacher) for teacher in teachers] if teachers != 0 else None,
             'guests': [format_teacher_response(guest) for guest in guests] if guests != 0 else None,
             'students': [format_student_response(student) for student in students] if students != 0 else None,
             'reports': [format_report_response(report) for report in reports] if reports != 0 else None,
-            'created_at': project_data[6].isoformat() if project_data[6] else None,
-            'updated_at': project_data[7].isoformat() if project_data[7] else None
+            'created_at': project_data.created_at,
+            'updated_at': project_data.updated_at
         }
     except Exception as e:
         print(f"Erro ao formatar projeto: {e}")
@@ -252,8 +339,8 @@ class AllDefenseMinutes(Resource):
                         'title': r[4],
                         'result': r[5],
                         'location': r[6],
-                        'started_at': r[7].isoformat() if r[7] else None,
-                        'created_at': r[8].isoformat() if r[8] else None,
+                        'started_at': r[7],
+                        'created_at': r[8],
                         'created_by': r[9],
                         'project_name': r[10]
                     } for r in result
@@ -371,10 +458,25 @@ class ProjectDetail(Resource):
     @token_required
     @project_ns.doc('get_project', description='Busca um projeto por ID')
     @project_ns.response(200, 'Projeto encontrado', project_model)
+    @project_ns.response(304, 'Não modificado (If-None-Match)')
     @project_ns.response(404, 'Projeto não encontrado')
     def get(self, current_user_id, project_id):
         """Busca um projeto específico por ID"""
         try:
+            version = Project.get_version(project_id)
+            if not version:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Projeto não encontrado'
+                }), 404)
+
+            etag = make_etag('project', project_id, version)
+            not_modified = not_modified_response(etag)
+            if not_modified:
+                return not_modified
+
+            bypass_entity_cache()
+
             project = Project.select_project_by_id(project_id)
             if not project:
                 return make_response(jsonify({
@@ -382,10 +484,10 @@ class ProjectDetail(Resource):
                     'message': 'Projeto não encontrado'
                 }), 404)
 
-            return make_response(jsonify({
+            return with_etag(make_response(jsonify({
                 'success': True,
                 'project': format_project_response(project)
-            }), 200)
+            }), 200), etag)
 
         except Exception as e:
             return make_response(jsonify({
@@ -511,15 +613,25 @@ class ProjectTeachers(Resource):
                     'message': 'Lista de professores vazia'
                 }), 400)
 
-            added = 0
-            for teacher_id in teacher_ids:
-                if not Project.check_teacher_in_project(project_id, teacher_id):
-                    if Project.add_teacher_to_project(project_id, teacher_id):
-                        added += 1
+            if not isinstance(teacher_ids, list):
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'teacher_ids deve ser uma lista'
+                }), 400)
+
+            result = Project.add_teachers_to_project_batch(project_id, teacher_ids, 'advisor')
+            if result is None:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao adicionar professores'
+                }), 500)
 
             return make_response(jsonify({
                 'success': True,
-                'message': f'{added} professor(es) adicionado(s) com sucesso!'
+                'message': f"{len(result['added'])} professor(es) adicionado(s) com sucesso!",
+                'added': result['added'],
+                'skipped': result['skipped'],
+                'invalid': result['invalid']
             }), 200)
 
         except Exception as e:
@@ -583,22 +695,16 @@ class ProjectGuests(Resource):
                 return make_response(jsonify({'success': False, 'message': 'guest_ids deve ser uma lista não vazia'}),
                                      422)
 
-            added = []
-            warnings = []
-            for guest_id in guest_ids:
-                # validar professor
-                if not Teacher.select_teacher_by_id(guest_id):
-                    warnings.append({'id': guest_id, 'message': 'Professor inválido'})
-                    continue
-                # não pode ser orientador
-                if Project.check_teacher_in_project_with_role(project_id, guest_id, 'advisor'):
-                    return make_response(jsonify({'success': False, 'message': 'Professor já é orientador do projeto'}),
-                                         400)
-                # idempotente: pular se já é guest
-                if Project.check_teacher_in_project_with_role(project_id, guest_id, 'guest'):
-                    continue
-                if Project.add_teacher_to_project_with_role(project_id, guest_id, 'guest'):
-                    added.append(guest_id)
+            # professores inválidos viram warnings, orientadores bloqueiam a operação
+            # e quem já é convidado é ignorado (idempotente)
+            result = Project.add_teachers_to_project_batch(project_id, guest_ids, 'guest', blocked_role='advisor')
+            if result is None:
+                return make_response(
+                    jsonify({'success': False, 'message': 'Erro ao adicionar convidados'}), 500)
+            if result['blocked']:
+                return make_response(jsonify({'success': False, 'message': 'Professor já é orientador do projeto',
+                                              'blocked': result['blocked']}), 400)
+            warnings = [{'id': guest_id, 'message': 'Professor inválido'} for guest_id in result['invalid']]
 
             # retornar lista de convidados atual
             guests = Project.get_project_teachers_by_role(project_id, 'guest')
@@ -606,6 +712,8 @@ class ProjectGuests(Resource):
                 'success': True,
                 'message': 'Convidados adicionados com sucesso',
                 'guests': [format_teacher_response(g) for g in guests] if guests != 0 else [],
+                'added': result['added'],
+                'skipped': result['skipped'],
                 'warnings': warnings
             }), 200)
         except Exception as e:
@@ -661,15 +769,25 @@ class ProjectStudents(Resource):
                     'message': 'Lista de alunos vazia'
                 }), 400)
 
-            added = 0
-            for student_id in student_ids:
-                if not Project.check_student_in_project(project_id, student_id):
-                    if Project.add_student_to_project(project_id, student_id):
-                        added += 1
+            if not isinstance(student_ids, list):
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'student_ids deve ser uma lista'
+                }), 400)
+
+            result = Project.add_students_to_project_batch(project_id, student_ids)
+            if result is None:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao adicionar alunos'
+                }), 500)
 
             return make_response(jsonify({
                 'success': True,
-                'message': f'{added} aluno(s) adicionado(s) com sucesso!'
+                'message': f"{len(result['added'])} aluno(s) adicionado(s) com sucesso!",
+                'added': result['added'],
+                'skipped': result['skipped'],
+                'invalid': result['invalid']
             }), 200)
 
         except Exception as e:
@@ -885,9 +1003,6 @@ class ProjectStatistics(Resource):
         try:
             stats = Project.get_project_statistics()
 
-            if stats['ultimo_cadastro']:
-                stats['ultimo_cadastro'] = stats['ultimo_cadastro'].isoformat()
-
             return make_response(jsonify({
                 'success': True,
                 'statistics': stats
@@ -901,6 +1016,111 @@ class ProjectStatistics(Resource):
             }), 500)
 
 
+@project_ns.route('/export')
+class ProjectExport(Resource):
+    """Exportação completa de projetos"""
+
+    @token_required
+    @project_ns.doc('export_projects', description='Exporta projetos com relações em NDJSON ou CSV (streaming)',
+                    params={'format': 'ndjson (padrão) ou csv', 'status': 'Status dos projetos (padrão: all)'})
+    @project_ns.response(200, 'Exportação gerada')
+    @project_ns.response(403, 'Não autorizado')
+    def get(self, current_user_id):
+        """Exporta todos os projetos"""
+        try:
+            if not require_admin(current_user_id):
+                return make_response(jsonify({'success': False, 'message': 'Não autorizado'}), 403)
+
+            export_format = request.args.get('format', 'ndjson').lower()
+            status = request.args.get('status', 'all')
+            stamp = datetime.now().strftime('%Y%m%d')
+
+            if export_format == 'csv':
+                generator = generate_project_csv(status)
+                mimetype = 'text/csv'
+            elif export_format == 'ndjson':
+                generator = generate_project_ndjson(status)
+                mimetype = 'application/x-ndjson'
+            else:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Formato inválido. Use ndjson ou csv'
+                }), 400)
+
+            response = Response(stream_with_context(generator), mimetype=mimetype)
+            response.headers['Content-Disposition'] = f'attachment; filename="projetos-{stamp}.{export_format}"'
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao exportar projetos',
+                'error': str(e)
+            }), 500)
+
+
+@project_ns.route('/statistics/by-course')
+class ProjectStatisticsByCourse(Resource):
+    """Estatísticas de projetos agrupadas por curso"""
+
+    @token_required
+    @project_ns.doc('get_statistics_by_course')
+    @project_ns.response(200, 'Estatísticas por curso retornadas')
+    def get(self, current_user_id):
+        """Retorna a contagem de projetos por status em cada curso"""
+        try:
+            courses = Project.get_statistics_by_course()
+            if courses is None:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao buscar estatísticas'
+                }), 500)
+
+            return make_response(jsonify({
+                'success': True,
+                'courses': courses,
+                'total': len(courses)
+            }), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao buscar estatísticas',
+                'error': str(e)
+            }), 500)
+
+
+@project_ns.route('/statistics/by-advisor')
+class ProjectStatisticsByAdvisor(Resource):
+    """Estatísticas de projetos agrupadas por orientador"""
+
+    @token_required
+    @project_ns.doc('get_statistics_by_advisor')
+    @project_ns.response(200, 'Estatísticas por orientador retornadas')
+    def get(self, current_user_id):
+        """Retorna a contagem de projetos por status de cada orientador"""
+        try:
+            advisors = Project.get_statistics_by_advisor()
+            if advisors is None:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao buscar estatísticas'
+                }), 500)
+
+            return make_response(jsonify({
+                'success': True,
+                'advisors': advisors,
+                'total': len(advisors)
+            }), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao buscar estatísticas',
+                'error': str(e)
+            }), 500)
+
 # ===== Files endpoints =====
 @project_ns.route('/<int:project_id>/files')
 class ProjectFiles(Resource):
@@ -47,7 +47,7 @@ def format_report_response(report_data):
         'feedback': report_data[6],
         'teacher': teacher,
         'project_id': report_data[8],
-        'created_at': report_data[9].isoformat() if report_data[9] else None,
-        'updated_at': report_data[10].isoformat() if report_data[10] else None
+        'created_at': report_data[9],
+        'updated_at': report_data[10]
     }
 
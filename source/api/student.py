@@ -1,11 +1,25 @@
 from flask import request, jsonify, make_response
 from flask_restx import Resource, Namespace, fields
 from decorators import token_required
-from utils.request_utils import get_json_data
+from utils.etag_utils import make_etag, not_modified_response, with_etag
+from utils.cache import bypass_entity_cache
+from utils.request_utils import get_json_data, get_keyset_page_args, build_next_cursor
 from models.student_model import Student
 from models.user_model import User
+from utils.spreadsheet_utils import iter_spreadsheet_rows
 from datetime import datetime
 
+IMPORT_BATCH_SIZE = 200
+
+IMPORT_HEADER_ALIASES = {
+    'nome': 'name',
+    'ra': 'registration',
+    'login': 'email',
+    'observacao': 'observation',
+    'telefone': 'telephone',
+    'imagem': 'image',
+}
+
 student_ns = Namespace('student', description='Gerenciamento de alunos')
 
 student_model = student_ns.model('Student', {
@@ -51,30 +65,69 @@ student_search_model = student_ns.model('StudentSearch', {
     'name': fields.String(description='Nome do aluno para buscar'),
     'start_date': fields.String(description='Data inicial (YYYY-MM-DD)'),
     'end_date': fields.String(description='Data final (YYYY-MM-DD)'),
+    'limit': fields.Integer(description='Tamanho da página (paginação keyset por data de cadastro)'),
+    'cursor': fields.Raw(description='next_cursor retornado pela página anterior'),
 })
 
 
+def validate_import_row(row, emails, registrations):
+    """
+    Valida uma linha da planilha de importação com as mesmas regras do POST
+
+    Args:
+        row (dict): Linha da planilha
+        emails (set): Emails já cadastrados ou já vistos no arquivo (minúsculos)
+        registrations (set): RAs já cadastrados ou já vistos no arquivo (minúsculos)
+
+    Returns:
+        tuple: (dict do aluno normalizado ou None, mensagem de erro ou None)
+    """
+    name = (row.get('name') or '').strip()
+    email = (row.get('email') or '').strip()
+    registration = (row.get('registration') or '').strip()
+
+    if len(name) < 3:
+        return None, 'Nome do aluno deve ter no mínimo 3 caracteres'
+    if len(email) < 3:
+        return None, 'Email do aluno deve ter no mínimo 3 caracteres'
+    if len(registration) < 3:
+        return None, 'RA do aluno deve ter no mínimo 3 caracteres'
+    if email.lower() in emails:
+        return None, 'Já existe um aluno cadastrado com este email'
+    if registration.lower() in registrations:
+        return None, 'Já existe um aluno cadastrado com este RA'
+
+    return {
+        'name': name,
+        'email': email,
+        'registration': registration,
+        'observation': (row.get('observation') or '').strip() or None,
+        'image': (row.get('image') or '').strip() or None,
+        'telephone': (row.get('telephone') or '').strip() or None,
+    }, None
+
+
 def format_student_response(student_data):
     """
     Formata os dados do aluno para resposta da API
 
     Args:
-        student_data (tuple): Tupla com dados do aluno do banco
+        student_data (StudentRow): Linha do aluno do banco
 
     Returns:
         dict: Dicionário formatado
     """
     return {
-        'id': student_data[0],
-        'name': student_data[1],
-        'registration': student_data[2],
-        'observation': student_data[3],
-        'image': student_data[4],
-        'status': student_data[5],
-        'telephone': student_data[9] if len(student_data) > 9 else None,
-        'user': User.select_user_by_id(student_data[6]).to_dict(),
-        'created_at': student_data[7].isoformat() if student_data[7] else None,
-        'updated_at': student_data[8].isoformat() if student_data[8] else None
+        'id': student_data.id,
+        'name': student_data.name,
+        'registration': student_data.registration,
+        'observation': student_data.observation,
+        'image': student_data.image,
+        'status': student_data.status,
+        'telephone': student_data.telephone,
+        'user': User.select_user_by_id(student_data.user_id).to_dict(),
+        'created_at': student_data.created_at,
+        'updated_at': student_data.updated_at
     }
 
 
@@ -353,22 +406,36 @@ class StudentDetail(Resource):
     @token_required
     @student_ns.doc('get_student', description='Busca um aluno por ID')
     @student_ns.response(200, 'Aluno encontrado', student_model)
+    @student_ns.response(304, 'Não modificado (If-None-Match)')
     @student_ns.response(404, 'Aluno não encontrado')
     def get(self, current_user_id, student_id):
         """Busca um aluno específico por ID"""
         try:
-            student = Student.select_student_by_id(student_id)
+            version = Student.get_version(student_id)
+            if not version:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Aluno não encontrado'
+                }), 404)
+
+            etag = make_etag('student', student_id, version)
+            not_modified = not_modified_response(etag)
+            if not_modified:
+                return not_modified
 
+            bypass_entity_cache()
+
+            student = Student.select_student_by_id(student_id)
             if not student:
                 return make_response(jsonify({
                     'success': False,
                     'message': 'Aluno não encontrado'
                 }), 404)
 
-            return make_response(jsonify({
+            return with_etag(make_response(jsonify({
                 'success': True,
                 'student': format_student_response(student)
-            }), 200)
+            }), 200), etag)
 
         except Exception as e:
             return make_response(jsonify({
@@ -395,19 +462,31 @@ class StudentSearch(Resource):
             start_date = data.get('start_date')
             end_date = data.get('end_date')
 
+            try:
+                limit, after = get_keyset_page_args(data)
+            except (TypeError, ValueError) as e:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Paginação inválida',
+                    'error': str(e)
+                }), 400)
+
             if name:
+                limit = None
                 students = Student.select_student_by_name(name)
-            elif start_date or end_date:
-                students = Student.select_student_by_date_range(start_date, end_date)
+            elif start_date or end_date or limit:
+                students = Student.select_student_by_date_range(start_date, end_date, limit, after)
             else:
                 students = Student.select_all_student()
+            students = students if students and students not in (0, "0") else []
 
             response = [format_student_response(student) for student in students]
 
             return make_response(jsonify({
                 'success': True,
                 'students': response,
-                'total': len(response)
+                'total': len(response),
+                'next_cursor': build_next_cursor(students, limit, 7)
             }), 200)
 
         except Exception as e:
@@ -416,3 +495,97 @@ class StudentSearch(Resource):
                 'message': 'Erro ao buscar alunos',
                 'error': str(e)
             }), 500)
+
+
+@student_ns.route('/import')
+class StudentImport(Resource):
+    """Endpoint para importação de alunos em lote"""
+
+    @token_required
+    @student_ns.doc('import_students', description='Importa alunos de uma planilha CSV ou XLSX (multipart, campo "file"). '
+                                                   'Colunas: name/nome, email/login, registration/ra, observation, telephone, image. '
+                                                   'Use dry_run=true para apenas validar.')
+    @student_ns.response(200, 'Importação processada')
+    @student_ns.response(400, 'Arquivo inválido')
+    def post(self, current_user_id):
+        """Importa alunos de uma planilha"""
+        try:
+            file = request.files.get('file')
+            dry_run = (request.form.get('dry_run') or request.args.get('dry_run') or '').lower() in ('1', 'true', 'yes')
+
+            try:
+                rows = iter_spreadsheet_rows(file, IMPORT_HEADER_ALIASES)
+            except ValueError as e:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': str(e)
+                }), 400)
+
+            lookups = Student.load_import_lookups()
+            if lookups is None:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao carregar alunos cadastrados'
+                }), 500)
+            emails, registrations = lookups
+
+            report = []
+            counts = {'created': 0, 'valid': 0, 'invalid': 0, 'failed': 0}
+            students = []
+
+            def flush(batch):
+                if dry_run:
+                    for line, student in batch:
+                        report.append({'line': line, 'email': student['email'], 'status': 'valid'})
+                    counts['valid'] += len(batch)
+                    return
+                inserted = Student.bulk_insert_students([student for _, student in batch])
+                for line, student in batch:
+                    if inserted is None:
+                        report.append({'line': line, 'email': student['email'], 'status': 'failed',
+                                       'message': 'Erro ao cadastrar aluno'})
+                    else:
+                        report.append({'line': line, 'email': student['email'], 'status': 'created',
+                                       'student_id': inserted.get(student['email'])})
+                counts['failed' if inserted is None else 'created'] += len(batch)
+
+            # A planilha inteira é lida e validada antes de qualquer INSERT:
+            # um erro de leitura no meio do arquivo não deixa importação parcial
+            try:
+                for line, row in rows:
+                    student, error = validate_import_row(row, emails, registrations)
+                    if error:
+                        report.append({'line': line, 'email': row.get('email'), 'status': 'invalid',
+                                       'message': error})
+                        counts['invalid'] += 1
+                        continue
+
+                    emails.add(student['email'].lower())
+                    registrations.add(student['registration'].lower())
+                    students.append((line, student))
+            except (ValueError, UnicodeDecodeError) as e:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao ler a planilha; nenhum aluno foi importado',
+                    'error': str(e),
+                    'counts': counts,
+                    'rows': report
+                }), 400)
+
+            for start in range(0, len(students), IMPORT_BATCH_SIZE):
+                flush(students[start:start + IMPORT_BATCH_SIZE])
+
+            return make_response(jsonify({
+                'success': counts['failed'] == 0,
+                'message': 'Planilha validada' if dry_run else 'Importação concluída',
+                'dry_run': dry_run,
+                'counts': counts,
+                'rows': report
+            }), 200)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao importar alunos',
+                'error': str(e)
+            }), 500)
@@ -1,8 +1,11 @@
 from flask import request, jsonify, make_response
 from flask_restx import Resource, Namespace, fields
 from decorators import token_required
-from utils.request_utils import get_json_data
+from utils.etag_utils import make_etag, not_modified_response, with_etag
+from utils.cache import bypass_entity_cache
+from utils.request_utils import get_json_data, get_keyset_page_args, build_next_cursor, normalize_ids
 from models.teacher_model import Teacher
+from models.course_model import Course
 from models.user_model import User
 from datetime import datetime
 
@@ -44,27 +47,44 @@ teacher_search_model = teacher_ns.model('TeacherSearch', {
     'name': fields.String(description='Nome do professor para buscar'),
     'start_date': fields.String(description='Data inicial (YYYY-MM-DD)'),
     'end_date': fields.String(description='Data final (YYYY-MM-DD)'),
+    'limit': fields.Integer(description='Tamanho da página (paginação keyset por data de cadastro)'),
+    'cursor': fields.Raw(description='next_cursor retornado pela página anterior'),
 })
 
+teacher_bulk_item_model = teacher_ns.model('TeacherBulkItem', {
+    'name': fields.String(required=True, description='Nome do professor', min_length=3, max_length=255),
+    'email': fields.String(required=True, description='Email/login do professor', min_length=3, max_length=255),
+    'observation': fields.String(description='Observação sobre o professor'),
+    'image': fields.String(description='Imagem do professor'),
+    'course_ids': fields.List(fields.Integer, description='IDs dos cursos do professor'),
+})
+
+teacher_bulk_model = teacher_ns.model('TeacherBulk', {
+    'teachers': fields.List(fields.Nested(teacher_bulk_item_model), required=True,
+                            description='Professores a cadastrar'),
+})
+
+MAX_BULK_TEACHERS = 500
+
 
 def format_teacher_response(teacher_data):
     """
     Formata os dados do professor para resposta da API
 
     Args:
-        teacher_data (tuple): Tupla com dados do professor do banco
+        teacher_data (TeacherRow): Linha do professor do banco
 
     Returns:
         dict: Dicionário formatado
     """
     return {
-        'id': teacher_data[0],
-        'name': teacher_data[1],
-        'observation': teacher_data[2],
-        'image': teacher_data[3],
-        'user': User.select_user_by_id(teacher_data[4]).to_dict(),
-        'created_at': teacher_data[5].isoformat() if teacher_data[5] else None,
-        'updated_at': teacher_data[6].isoformat() if teacher_data[6] else None
+        'id': teacher_data.id,
+        'name': teacher_data.name,
+        'observation': teacher_data.observation,
+        'image': teacher_data.image,
+        'user': User.select_user_by_id(teacher_data.user_id).to_dict(),
+        'created_at': teacher_data.created_at,
+        'updated_at': teacher_data.updated_at
     }
 
 
@@ -300,6 +320,107 @@ class ActiveTeacher(Resource):
                 'error': str(e)
             }), 500)
 
+@teacher_ns.route('/bulk')
+class TeacherBulk(Resource):
+    """Endpoint para cadastro de professores em lote"""
+
+    @token_required
+    @teacher_ns.doc('bulk_create_teachers', description='Cadastra vários professores e seus vínculos com cursos')
+    @teacher_ns.expect(teacher_bulk_model)
+    @teacher_ns.response(201, 'Professores cadastrados')
+    @teacher_ns.response(400, 'Dados inválidos')
+    def post(self, current_user_id):
+        """Cadastra professores em lote"""
+        try:
+            data = get_json_data()
+            teachers = data.get('teachers') if data else None
+            if not isinstance(teachers, list) or not teachers:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Lista de professores é obrigatória'
+                }), 400)
+            if len(teachers) > MAX_BULK_TEACHERS:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': f'Máximo de {MAX_BULK_TEACHERS} professores por requisição'
+                }), 400)
+
+            emails = [str(item.get('email') or '').strip() for item in teachers if isinstance(item, dict)]
+            existing = Teacher.find_existing_usernames([email for email in emails if email])
+            course_ids = normalize_ids([course_id for item in teachers if isinstance(item, dict)
+                                        for course_id in (item.get('course_ids') or [])])[0]
+            valid_courses = Course.select_existing_course_ids(course_ids)
+            if existing is None or valid_courses is None:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao validar professores'
+                }), 500)
+
+            report = []
+            to_insert = []
+            for index, item in enumerate(teachers):
+                if not isinstance(item, dict):
+                    report.append({'index': index, 'status': 'invalid', 'message': 'Item inválido'})
+                    continue
+
+                name = str(item.get('name') or '').strip()
+                email = str(item.get('email') or '').strip()
+                ids, invalid_ids = normalize_ids(item.get('course_ids') or [])
+                unknown_ids = [course_id for course_id in ids if course_id not in valid_courses]
+
+                error = None
+                if len(name) < 3:
+                    error = 'Nome do professor deve ter no mínimo 3 caracteres'
+                elif len(email) < 3:
+                    error = 'Email do professor deve ter no mínimo 3 caracteres'
+                elif email.lower() in existing:
+                    error = 'Já existe um professor cadastrado com este email'
+                elif invalid_ids or unknown_ids:
+                    error = f'Cursos inválidos: {invalid_ids + unknown_ids}'
+
+                if error:
+                    report.append({'index': index, 'email': email, 'status': 'invalid', 'message': error})
+                    continue
+
+                existing.add(email.lower())
+                to_insert.append((index, {
+                    'name': name,
+                    'email': email,
+                    'observation': str(item.get('observation') or '').strip() or None,
+                    'image': str(item.get('image') or '').strip() or None,
+                    'course_ids': ids,
+                }))
+
+            inserted = Teacher.bulk_insert_teachers([teacher for _, teacher in to_insert])
+            if inserted is None:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Erro ao cadastrar professores'
+                }), 500)
+
+            for index, teacher in to_insert:
+                report.append({'index': index, 'email': teacher['email'], 'status': 'created',
+                               'teacher_id': inserted.get(teacher['email']),
+                               'course_ids': teacher['course_ids']})
+            report.sort(key=lambda entry: entry['index'])
+
+            created = len(to_insert)
+            return make_response(jsonify({
+                'success': created > 0,
+                'message': f'{created} professor(es) cadastrado(s)',
+                'created': created,
+                'invalid': len(teachers) - created,
+                'teachers': report
+            }), 201 if created else 400)
+
+        except Exception as e:
+            return make_response(jsonify({
+                'success': False,
+                'message': 'Erro ao cadastrar professores',
+                'error': str(e)
+            }), 500)
+
+
 @teacher_ns.route('/<int:teacher_id>')
 class TeacherDetail(Resource):
     """Endpoints para busca de professores específico"""
@@ -307,22 +428,36 @@ class TeacherDetail(Resource):
     @token_required
     @teacher_ns.doc('get_teacher', description='Busca um professor por ID')
     @teacher_ns.response(200, 'Professor encontrado', teacher_model)
+    @teacher_ns.response(304, 'Não modificado (If-None-Match)')
     @teacher_ns.response(404, 'Professor não encontrado')
     def get(self, current_user_id, teacher_id):
         """Busca um professor específico por ID"""
         try:
-            teacher = Teacher.select_teacher_by_id(teacher_id)
+            version = Teacher.get_version(teacher_id)
+            if not version:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Professor não encontrado'
+                }), 404)
 
+            etag = make_etag('teacher', teacher_id, version)
+            not_modified = not_modified_response(etag)
+            if not_modified:
+                return not_modified
+
+            bypass_entity_cache()
+
+            teacher = Teacher.select_teacher_by_id(teacher_id)
             if not teacher:
                 return make_response(jsonify({
                     'success': False,
                     'message': 'Professor não encontrado'
                 }), 404)
 
-            return make_response(jsonify({
+            return with_etag(make_response(jsonify({
                 'success': True,
                 'teacher': format_teacher_response(teacher)
-            }), 200)
+            }), 200), etag)
 
         except Exception as e:
             return make_response(jsonify({
@@ -349,19 +484,31 @@ class TeacherSearch(Resource):
             start_date = data.get('start_date')
             end_date = data.get('end_date')
 
+            try:
+                limit, after = get_keyset_page_args(data)
+            except (TypeError, ValueError) as e:
+                return make_response(jsonify({
+                    'success': False,
+                    'message': 'Paginação inválida',
+                    'error': str(e)
+                }), 400)
+
             if name:
+                limit = None
                 teachers = Teacher.select_teacher_by_name(name)
-            elif start_date or end_date:
-                teachers = Teacher.select_teacher_by_date_range(start_date, end_date)
+            elif start_date or end_date or limit:
+                teachers = Teacher.select_teacher_by_date_range(start_date, end_date, limit, after)
             else:
                 teachers = Teacher.select_all_teacher()
+            teachers = teachers if teachers and teachers not in (0, "0") else []
 
             response = [format_teacher_response(teacher) for teacher in teachers]
 
             return make_response(jsonify({
                 'success': True,
                 'teachers': response,
-                'total': len(response)
+                'total': len(response),
+                'next_cursor': build_next_cursor(teachers, limit, 5)
             }), 200)
 
         except Exception as e:
@@ -1,8 +1,14 @@
 from run_migrations import run_all_migrations
+from reconcile_counters import start_reconciliation_thread
 from flask import Flask
 from flask_restx import Api
 from cors import enable_cors
+from compression import enable_compression
+from utils.query_stats import enable_query_stats
+from utils.metrics import enable_metrics
 from utils.config import Config
+from utils.json_provider import FastJSONProvider
+from utils.identity_map import clear_identity_map
 from utils.mysqlUtils import initialize_database
 from api.auth import auth_ns
 from api.course import course_ns
@@ -11,12 +17,18 @@ from api.student import student_ns
 from api.project import project_ns
 from api.report import report_ns
 from api.date import date_status_ns
+from api.admin import admin_ns
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
+    app.teardown_appcontext(clear_identity_map)
+    enable_metrics(app)
     enable_cors(app)
+    enable_compression(app)
+    enable_query_stats(app)
     api = Api(
         app,
         version='1.0',
@@ -31,12 +43,14 @@ def create_app():
     api.add_namespace(project_ns, path='/project')
     api.add_namespace(report_ns, path='/report')
     api.add_namespace(date_status_ns, path='/date')
+    api.add_namespace(admin_ns, path='/admin')
     return app
 
 
 app = create_app()
 initialize_database()
 run_all_migrations()
+start_reconciliation_thread(Config.PROJECT_COUNTERS_RECONCILE_INTERVAL)
 
 if __name__ == "__main__":
     print("=" * 60)
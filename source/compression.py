@@ -0,0 +1,121 @@
+import time
+import zlib
+from functools import partial
+from flask import Flask, request
+from utils.config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+
+def is_compressible(mimetype):
+    """Verifica se o tipo de conteúdo vale a pena comprimir (texto/JSON)"""
+    if not mimetype:
+        return False
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def choose_encoding():
+    """
+    Escolhe a codificação a partir do Accept-Encoding da requisição
+
+    Returns:
+        str: 'br', 'gzip' ou None se o cliente não aceitar nenhuma
+    """
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br'] > 0 and accepted['br'] >= accepted['gzip']:
+        return 'br'
+    if accepted['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(Config.COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """
+    Comprime uma resposta em streaming pedaço a pedaço
+
+    Geradores como o feed .ics e o CSV entregam uma linha por vez; um flush
+    por linha produziria blocos quase do tamanho original. O compressor
+    acumula a entrada e só força o envio (flush) depois de
+    COMPRESSION_STREAM_FLUSH_SIZE bytes ou quando o último envio ficou
+    mais de COMPRESSION_STREAM_FLUSH_INTERVAL segundos para trás.
+    """
+    try:
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=Config.COMPRESSION_BROTLI_QUALITY)
+            compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(Config.COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+            compress, finish = compressor.compress, compressor.flush
+            flush = partial(compressor.flush, zlib.Z_SYNC_FLUSH)
+
+        pending = 0
+        last_flush = time.monotonic()
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress(chunk)
+            pending += len(chunk)
+            now = time.monotonic()
+            if pending >= Config.COMPRESSION_STREAM_FLUSH_SIZE or \
+                    now - last_flush >= Config.COMPRESSION_STREAM_FLUSH_INTERVAL:
+                data += flush()
+                pending = 0
+                last_flush = now
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+
+def enable_compression(app: Flask):
+    @app.after_request
+    def compress_response(response):
+        if not Config.COMPRESSION_ENABLED:
+            return response
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or not is_compressible(response.mimetype)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < Config.COMPRESSION_MIN_SIZE:
+                return response
+            response.set_data(compress_body(data, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        # O corpo mudou de bytes: um ETag forte deixa de valer
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
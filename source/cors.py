@@ -1,21 +1,38 @@
-from flask import Flask, request, make_response
+from flask import Flask, request
+from utils.config import Config
+
 
 def enable_cors(app: Flask):
+    allowed_origins = frozenset(Config.CORS_ALLOWED_ORIGINS)
+    allow_any_origin = '*' in allowed_origins
+
+    # Cabeçalhos montados uma única vez; cada resposta só recebe um update()
+    common_headers = {
+        'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+        'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+        # Allow frontend to read filename from download responses and query stats
+        'Access-Control-Expose-Headers': 'Content-Disposition, X-Query-Count, Server-Timing',
+    }
+    if allow_any_origin:
+        common_headers['Access-Control-Allow-Origin'] = '*'
+    preflight_headers = dict(common_headers, **{'Access-Control-Max-Age': str(Config.CORS_MAX_AGE)})
+
+    def apply_headers(response, headers):
+        response.headers.update(headers)
+        if not allow_any_origin:
+            origin = request.headers.get('Origin')
+            if origin in allowed_origins:
+                response.headers['Access-Control-Allow-Origin'] = origin
+            response.vary.add('Origin')
+        return response
+
     @app.after_request
     def add_cors_headers(response):
-        response.headers['Access-Control-Allow-Origin'] = '*'
-        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-        # Allow frontend to read filename from download responses
-        response.headers['Access-Control-Expose-Headers'] = 'Content-Disposition'
-        return response
+        if request.method == 'OPTIONS':
+            return response
+        return apply_headers(response, common_headers)
 
     @app.before_request
     def handle_options_requests():
         if request.method == 'OPTIONS':
-            response = make_response()
-            response.headers['Access-Control-Allow-Origin'] = '*'
-            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-            response.headers['Access-Control-Expose-Headers'] = 'Content-Disposition'
-            return response
\ No newline at end of file
+            return apply_headers(app.response_class(status=204), preflight_headers)
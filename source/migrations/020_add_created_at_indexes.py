@@ -0,0 +1,24 @@
+from utils.mysqlUtils import execute_migration
+
+# Índices (created_at, id) para filtros de data sargáveis e paginação keyset
+CREATE_INDEX_STUDENTS = """
+CREATE INDEX idx_students_created_at_id ON students(created_at, id);
+"""
+
+CREATE_INDEX_TEACHERS = """
+CREATE INDEX idx_teachers_created_at_id ON teachers(created_at, id);
+"""
+
+CREATE_INDEX_COURSE = """
+CREATE INDEX idx_course_created_at_id ON course(created_at, id);
+"""
+
+
+def run_migration():
+    execute_migration(CREATE_INDEX_STUDENTS)
+    execute_migration(CREATE_INDEX_TEACHERS)
+    execute_migration(CREATE_INDEX_COURSE)
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,81 @@
+from utils.mysqlUtils import execute_migration
+
+# Remove vínculos duplicados antes de criar as chaves únicas
+DEDUPE_TEACHER_PROJECT = """
+DELETE tp1 FROM teacher_project tp1
+INNER JOIN teacher_project tp2
+    ON tp1.project_id = tp2.project_id
+    AND tp1.teacher_id = tp2.teacher_id
+    AND tp1.id > tp2.id;
+"""
+
+DEDUPE_STUDENT_PROJECT = """
+DELETE sp1 FROM student_project sp1
+INNER JOIN student_project sp2
+    ON sp1.project_id = sp2.project_id
+    AND sp1.student_id = sp2.student_id
+    AND sp1.id > sp2.id;
+"""
+
+DEDUPE_TEACHER_COURSE = """
+DELETE tc1 FROM teacher_course tc1
+INNER JOIN teacher_course tc2
+    ON tc1.teacher_id = tc2.teacher_id
+    AND tc1.course_id = tc2.course_id
+    AND tc1.id > tc2.id;
+"""
+
+DEDUPE_STUDENT_COURSE = """
+DELETE sc1 FROM student_course sc1
+INNER JOIN student_course sc2
+    ON sc1.student_id = sc2.student_id
+    AND sc1.course_id = sc2.course_id
+    AND sc1.id > sc2.id;
+"""
+
+# Um professor participa de um projeto uma única vez (orientador ou convidado)
+UNIQUE_TEACHER_PROJECT = """
+CREATE UNIQUE INDEX uq_teacher_project ON teacher_project(project_id, teacher_id);
+"""
+
+INDEX_TEACHER_PROJECT_ROLE = """
+CREATE INDEX idx_teacher_project_project_role ON teacher_project(project_id, role, teacher_id);
+"""
+
+UNIQUE_STUDENT_PROJECT = """
+CREATE UNIQUE INDEX uq_student_project ON student_project(project_id, student_id);
+"""
+
+UNIQUE_TEACHER_COURSE = """
+CREATE UNIQUE INDEX uq_teacher_course ON teacher_course(teacher_id, course_id);
+"""
+
+UNIQUE_STUDENT_COURSE = """
+CREATE UNIQUE INDEX uq_student_course ON student_course(student_id, course_id);
+"""
+
+INDEX_PROJECTS_STATUS = """
+CREATE INDEX idx_projects_status_name ON projects(status, name);
+"""
+
+INDEX_REPORT_PROJECT = """
+CREATE INDEX idx_report_project_created ON report(project_id, created_at);
+"""
+
+
+def run_migration():
+    execute_migration(DEDUPE_TEACHER_PROJECT)
+    execute_migration(DEDUPE_STUDENT_PROJECT)
+    execute_migration(DEDUPE_TEACHER_COURSE)
+    execute_migration(DEDUPE_STUDENT_COURSE)
+    execute_migration(UNIQUE_TEACHER_PROJECT)
+    execute_migration(INDEX_TEACHER_PROJECT_ROLE)
+    execute_migration(UNIQUE_STUDENT_PROJECT)
+    execute_migration(UNIQUE_TEACHER_COURSE)
+    execute_migration(UNIQUE_STUDENT_COURSE)
+    execute_migration(INDEX_PROJECTS_STATUS)
+    execute_migration(INDEX_REPORT_PROJECT)
+
+
+if __name__ == "__main__":
+    run_migration()
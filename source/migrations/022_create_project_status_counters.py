@@ -0,0 +1,33 @@
+from utils.mysqlUtils import execute_migration
+
+# Contadores de projetos por status, mantidos pelas escritas em Project
+CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS project_status_counters (
+    status VARCHAR(50) NOT NULL PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+"""
+
+BACKFILL_QUERY = """
+INSERT INTO project_status_counters (status, total)
+SELECT COALESCE(status, ''), COUNT(*)
+FROM projects
+GROUP BY COALESCE(status, '')
+ON DUPLICATE KEY UPDATE total = VALUES(total);
+"""
+
+# MAX(created_at) das estatísticas passa a ser lido direto do índice
+CREATE_INDEX_PROJECTS_CREATED_AT = """
+CREATE INDEX idx_projects_created_at ON projects(created_at);
+"""
+
+
+def run_migration():
+    execute_migration(CREATE_TABLE_QUERY)
+    execute_migration(BACKFILL_QUERY)
+    execute_migration(CREATE_INDEX_PROJECTS_CREATED_AT)
+
+
+if __name__ == "__main__":
+    run_migration()
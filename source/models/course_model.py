@@ -1,4 +1,9 @@
-from utils.mysqlUtils import send_sql_command
+from utils.mysqlUtils import send_sql_command, send_bulk_command, transaction
+from utils.row_types import row_type, wrap, wrap_one
+from utils.cache import cached, invalidate, cached_entity, invalidate_entity
+from utils.identity_map import lookup, evict
+from collections import Counter
+from utils.config import Config
 from datetime import datetime
 
 """
@@ -7,9 +12,16 @@ Responsável pelas operações de banco de dados relacionadas aos cursos
 """
 
 
+COURSE_COLUMNS = ('id', 'name', 'observation', 'status', 'created_at', 'updated_at',
+                  'responsible_teacher_name', 'responsible_signature_url')
+CourseRow = row_type('CourseRow', COURSE_COLUMNS)
+
+
 class Course:
     """Classe para gerenciar operações de cursos no banco de dados"""
 
+    __slots__ = ('id', 'name', 'observation', 'status', 'created_at')
+
     def __init__(self, id, name, observation, status, created_at):
         self.id = id
         self.name = name
@@ -44,7 +56,7 @@ class Course:
                 FROM course 
                 ORDER BY name ASC
             """
-            return send_sql_command(query)
+            return wrap(CourseRow, send_sql_command(query))
         else:
             query = """
                 SELECT id, name, observation, status, created_at, updated_at,
@@ -53,7 +65,7 @@ class Course:
                 WHERE status = %s
                 ORDER BY name ASC
             """
-            return send_sql_command(query, (status,))
+            return wrap(CourseRow, send_sql_command(query, (status,)))
 
     @staticmethod
     def select_course_by_id(course_id):
@@ -64,16 +76,49 @@ class Course:
             course_id (int): ID do curso
 
         Returns:
-            tuple: Dados do curso ou None se não encontrado
+            CourseRow: Dados do curso ou None se não encontrado
         """
+        return lookup('course', course_id,
+                      lambda: cached_entity('course', course_id, lambda: Course._select_course_by_id(course_id)))
+
+    @staticmethod
+    def _select_course_by_id(course_id):
         query = """
             SELECT id, name, observation, status, created_at, updated_at,
                    responsible_teacher_name, responsible_signature_url
             FROM course 
             WHERE id = %s
         """
+        return wrap_one(CourseRow, send_sql_command(query, (course_id,)))
+
+    @staticmethod
+    def get_version(course_id):
+        """
+        Consulta barata de versão do curso, usada para o ETag
+
+        Args:
+            course_id (int): ID do curso
+
+        Returns:
+            tuple: (última alteração, checksum das colunas) ou None se o curso
+                   não existe
+
+        Raises:
+            RuntimeError: Se a consulta falhar (não confundir com 404)
+        """
+        # updated_at tem resolução de segundos: o checksum diferencia duas
+        # escritas no mesmo segundo
+        query = """
+            SELECT COALESCE(updated_at, created_at),
+                   CRC32(CONCAT_WS('|', name, observation, status,
+                                   responsible_teacher_name, responsible_signature_url))
+            FROM course
+            WHERE id = %s
+        """
         result = send_sql_command(query, (course_id,))
-        return result[0] if result != 0 else None
+        if result == "0":
+            raise RuntimeError("Falha ao consultar a versão do curso")
+        return result[0] if result else None
 
     @staticmethod
     def select_courses_by_name(name):
@@ -87,57 +132,71 @@ class Course:
             list: Lista de cursos encontrados
         """
         query = """
-            SELECT id, name, observation, status, created_at, updated_at 
+            SELECT id, name, observation, status, created_at, updated_at,
+                   responsible_teacher_name, responsible_signature_url
             FROM course 
             WHERE name LIKE %s AND status = 'ativo'
             ORDER BY name ASC
         """
         search_term = f"%{name}%"
-        return send_sql_command(query, (search_term,))
+        return wrap(CourseRow, send_sql_command(query, (search_term,)))
 
     @staticmethod
-    def select_courses_by_date_range(start_date=None, end_date=None, status='ativo'):
+    def select_courses_by_date_range(start_date=None, end_date=None, status='ativo', limit=None, after=None):
         """
         Busca cursos por intervalo de datas de cadastro
 
+        O filtro usa intervalo semiaberto sobre created_at (sem DATE()),
+        permitindo uso do índice (created_at, id). Com limit informado, a
+        paginação é por keyset: after recebe (created_at, id) do último
+        registro da página anterior.
+
         Args:
             start_date (str): Data inicial (formato: YYYY-MM-DD)
-            end_date (str): Data final (formato: YYYY-MM-DD)
-            status (str): Status dos cursos
+            end_date (str): Data final, inclusiva (formato: YYYY-MM-DD)
+            status (str): Status dos cursos ('ativo', 'inativo', 'all')
+            limit (int, optional): Tamanho da página
+            after (tuple, optional): Cursor (created_at, id) da página anterior
 
         Returns:
             list: Lista de cursos no intervalo de datas
         """
-        if start_date and end_date:
-            query = """
-                SELECT id, name, observation, status, created_at, updated_at 
-                FROM course 
-                WHERE DATE(created_at) BETWEEN %s AND %s
-                AND status = %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (start_date, end_date, status))
-        elif start_date:
-            query = """
-                SELECT id, name, observation, status, created_at, updated_at 
-                FROM course 
-                WHERE DATE(created_at) >= %s
-                AND status = %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (start_date, status))
-        elif end_date:
-            query = """
-                SELECT id, name, observation, status, created_at, updated_at 
-                FROM course 
-                WHERE DATE(created_at) <= %s
-                AND status = %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (end_date, status))
-        else:
+        conditions = []
+        params = []
+
+        if start_date:
+            conditions.append("created_at >= %s")
+            params.append(start_date)
+
+        if end_date:
+            conditions.append("created_at < DATE_ADD(%s, INTERVAL 1 DAY)")
+            params.append(end_date)
+
+        if after:
+            conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+            params.extend([after[0], after[0], after[1]])
+
+        if not conditions and limit is None:
             return Course.select_all_courses(status)
 
+        if status != 'all':
+            conditions.append("status = %s")
+            params.append(status)
+
+        query = """
+            SELECT id, name, observation, status, created_at, updated_at,
+                   responsible_teacher_name, responsible_signature_url
+            FROM course
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        return wrap(CourseRow, send_sql_command(query, tuple(params)))
+
     @staticmethod
     def insert_course(name, observation=None, responsible_teacher_name=None, responsible_signature_url=None):
         """
@@ -157,6 +216,7 @@ class Course:
             VALUES (%s, %s, 'ativo', %s, %s)
         """
         result = send_sql_command(query, (name, observation, responsible_teacher_name, responsible_signature_url))
+        invalidate('course_stats', 'project_group_stats')
         # print("-" * 10)
         # print(result)
         return result if result != 0 else None
@@ -206,6 +266,9 @@ class Course:
         """
 
         send_sql_command(query, tuple(params))
+        invalidate_entity('course', course_id)
+        if name is not None:
+            invalidate('project_group_stats')
         return True
 
     @staticmethod
@@ -226,6 +289,8 @@ class Course:
             WHERE id = %s
         """
         send_sql_command(query, (status, course_id))
+        invalidate_entity('course', course_id)
+        invalidate('course_stats')
         return True
 
     @staticmethod
@@ -262,15 +327,39 @@ class Course:
         Exclusão física - remove o curso do banco de dados
         CUIDADO: Esta operação não pode ser desfeita!
 
+        A FK de projects remove em cascata os projetos do curso; os
+        contadores de status desses projetos são decrementados na mesma
+        transação.
+
         Args:
             course_id (int): ID do curso
 
         Returns:
             bool: True se removido com sucesso
         """
-        query = "DELETE FROM course WHERE id = %s"
-        result = send_sql_command(query, (course_id,))
-        return result != 0
+        try:
+            with transaction() as (connection, cursor):
+                cursor.execute("SELECT COALESCE(status, '') FROM projects WHERE course_id = %s FOR UPDATE",
+                               (course_id,))
+                removed = Counter(status for (status,) in cursor.fetchall())
+                cursor.execute("DELETE FROM course WHERE id = %s", (course_id,))
+                deleted = cursor.rowcount > 0
+                if deleted and removed:
+                    send_bulk_command("""
+                        UPDATE project_status_counters
+                        SET total = GREATEST(total - %s, 0)
+                        WHERE status = %s
+                    """, [(total, status) for status, total in removed.items()], cursor=cursor)
+        except Exception as e:
+            print(f"[ERROR] permanent_delete_course: {e}")
+            return False
+
+        invalidate_entity('course', course_id)
+        invalidate('course_stats', 'project_group_stats')
+        if removed:
+            evict('project')
+            invalidate('project_stats')
+        return deleted
 
     @staticmethod
     def check_course_exists(course_id):
@@ -287,6 +376,26 @@ class Course:
         result = send_sql_command(query, (course_id,))
         return result != 0
 
+    @staticmethod
+    def select_existing_course_ids(course_ids):
+        """
+        Filtra, em uma única consulta, os ids de curso que existem
+
+        Args:
+            course_ids (list): IDs de curso
+
+        Returns:
+            set: IDs existentes ou None em caso de erro
+        """
+        if not course_ids:
+            return set()
+        placeholders = ", ".join(["%s"] * len(course_ids))
+        query = f"SELECT id FROM course WHERE id IN ({placeholders})"
+        result = send_sql_command(query, tuple(course_ids))
+        if result == "0":
+            return None
+        return {row[0] for row in result} if result else set()
+
     @staticmethod
     def check_course_name_exists(name, exclude_id=None):
         """
@@ -331,11 +440,17 @@ class Course:
     @staticmethod
     def get_course_statistics():
         """
-        Retorna estatísticas dos cursos
+        Retorna estatísticas dos cursos (em cache até a próxima escrita)
 
         Returns:
             dict: Dicionário com estatísticas
         """
+        return cached('course_stats', 'all', Course._select_course_statistics,
+                      Config.STATISTICS_CACHE_TTL)
+
+    @staticmethod
+    def _select_course_statistics():
+        """Calcula as estatísticas dos cursos direto no banco"""
         query = """
             SELECT 
                 COUNT(*) as total,
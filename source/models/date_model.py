@@ -1,5 +1,86 @@
-from utils.mysqlUtils import send_sql_command
-from datetime import datetime
+from utils.mysqlUtils import send_sql_command, send_bulk_command, stream_sql
+from utils.config import Config
+from utils.cache import cached, invalidate
+from datetime import datetime, date
+import threading
+import time
+
+# Versão do calendário: incrementada a cada escrita em date_status.
+# Invalida o cache compacto por ano mantido em memória neste processo.
+_calendar_version = 0
+_calendar_lock = threading.Lock()
+_year_calendars = {}
+_feed_versions = {}
+
+
+def bump_calendar_version():
+    """Incrementa a versão do calendário e descarta os anos em cache"""
+    global _calendar_version
+    with _calendar_lock:
+        _calendar_version += 1
+        _year_calendars.clear()
+        _feed_versions.clear()
+    invalidate('date_stats')
+
+
+class YearCalendar:
+    """
+    Representação compacta dos status de um ano
+
+    Cada dia do ano ocupa um byte em days (0 = sem status, 1 a 6 = status),
+    indexado pelo dia do ano a partir de 0. counts guarda o total por status.
+    """
+
+    __slots__ = ('year', 'version', 'loaded_at', 'days', 'counts')
+
+    def __init__(self, year, version, statuses):
+        self.year = year
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.days = bytearray(366)
+        self.counts = [0] * 7
+        first_day = date(year, 1, 1).toordinal()
+        for date_str, status in statuses.items():
+            self.days[date.fromisoformat(date_str).toordinal() - first_day] = status
+            self.counts[status] += 1
+
+    def is_fresh(self, version):
+        """Verifica se o ano ainda corresponde à versão atual e ao TTL"""
+        return self.version == version and \
+            time.monotonic() - self.loaded_at < Config.CALENDAR_CACHE_TTL
+
+    def to_dict(self):
+        """Retorna os status no formato {YYYY-MM-DD: status}"""
+        first_day = date(self.year, 1, 1).toordinal()
+        return {
+            date.fromordinal(first_day + index).isoformat(): status
+            for index, status in enumerate(self.days) if status
+        }
+
+    def statistics(self):
+        """Retorna as estatísticas no mesmo formato de get_date_status_statistics"""
+        stats = {'total': sum(self.counts)}
+        for status in range(1, 7):
+            stats[f'status_{status}'] = self.counts[status]
+        return stats
+
+
+def year_bounds(start_year, end_year=None):
+    """
+    Retorna o intervalo semiaberto [início, fim) de datas para um ou mais anos
+
+    Comparar date com esses limites permite usar o índice idx_date,
+    ao contrário de YEAR(date) = %s.
+
+    Args:
+        start_year (int): Ano inicial
+        end_year (int, optional): Ano final, inclusivo (padrão: start_year)
+
+    Returns:
+        tuple: ('YYYY-01-01', 'YYYY+1-01-01')
+    """
+    end_year = start_year if end_year is None else end_year
+    return f"{int(start_year):04d}-01-01", f"{int(end_year) + 1:04d}-01-01"
 
 
 class DateStatus:
@@ -17,13 +98,7 @@ class DateStatus:
             list: Lista de tuplas com os dados dos status de datas
         """
         if year:
-            query = """
-                SELECT id, date, status, created_at, updated_at
-                FROM date_status
-                WHERE YEAR(date) = %s
-                ORDER BY date ASC
-            """
-            return send_sql_command(query, (year,))
+            return DateStatus.select_date_statuses_by_year_range(year, year)
         else:
             query = """
                 SELECT id, date, status, created_at, updated_at
@@ -32,6 +107,27 @@ class DateStatus:
             """
             return send_sql_command(query)
 
+    @staticmethod
+    def select_date_statuses_by_year_range(start_year, end_year):
+        """
+        Busca todos os status de datas de um intervalo de anos
+
+        Args:
+            start_year (int): Ano inicial
+            end_year (int): Ano final (inclusivo)
+
+        Returns:
+            list: Lista de tuplas com os dados dos status de datas
+        """
+        start, end = year_bounds(start_year, end_year)
+        query = """
+            SELECT id, date, status, created_at, updated_at
+            FROM date_status
+            WHERE date >= %s AND date < %s
+            ORDER BY date ASC
+        """
+        return send_sql_command(query, (start, end))
+
     @staticmethod
     def select_date_status_by_id(status_id):
         """
@@ -119,6 +215,81 @@ class DateStatus:
             """
             return send_sql_command(query, (start_date, end_date))
 
+    @staticmethod
+    def stream_date_statuses_by_date_range(start_date, end_date, status=None):
+        """
+        Percorre os status de um intervalo sob demanda (cursor server-side)
+
+        Mesmas colunas e ordem de select_date_statuses_by_date_range, sem
+        materializar o resultado.
+
+        Args:
+            start_date (str): Data inicial (YYYY-MM-DD)
+            end_date (str): Data final (YYYY-MM-DD)
+            status (int, optional): Filtrar por status específico
+
+        Yields:
+            tuple: (id, date, status, created_at, updated_at)
+        """
+        query = """
+            SELECT id, date, status, created_at, updated_at
+            FROM date_status
+            WHERE date BETWEEN %s AND %s
+        """
+        params = [start_date, end_date]
+        if status:
+            query += " AND status = %s"
+            params.append(status)
+        query += " ORDER BY date ASC"
+        return stream_sql(query, tuple(params))
+
+    @staticmethod
+    def get_feed_version(start_date, end_date, status=None):
+        """
+        Retorna a versão de um intervalo para ETag/Last-Modified
+
+        Consulta MAX(updated_at) e COUNT(*) pelo índice de date (o COUNT
+        detecta exclusões). O resultado fica em memória até a próxima
+        escrita em date_status, então GETs condicionais repetidos não
+        consultam o banco.
+
+        Args:
+            start_date (str): Data inicial (YYYY-MM-DD)
+            end_date (str): Data final (YYYY-MM-DD)
+            status (int, optional): Filtrar por status específico
+
+        Returns:
+            tuple: (última modificação ou None, total de datas)
+
+        Raises:
+            RuntimeError: Se a consulta falhar (erros não ficam em cache)
+        """
+        key = (start_date, end_date, status)
+        version = _calendar_version
+        cached = _feed_versions.get(key)
+        if cached and cached[0] == version and \
+                time.monotonic() - cached[1] < Config.CALENDAR_CACHE_TTL:
+            return cached[2]
+
+        query = """
+            SELECT MAX(COALESCE(updated_at, created_at)), COUNT(*)
+            FROM date_status
+            WHERE date BETWEEN %s AND %s
+        """
+        params = [start_date, end_date]
+        if status:
+            query += " AND status = %s"
+            params.append(status)
+        result = send_sql_command(query, tuple(params))
+        if result == "0":
+            raise RuntimeError("Falha ao consultar a versão do calendário")
+        feed_version = (result[0][0], result[0][1]) if result else (None, 0)
+
+        with _calendar_lock:
+            if _calendar_version == version:
+                _feed_versions[key] = (version, time.monotonic(), feed_version)
+        return feed_version
+
     @staticmethod
     def insert_date_status(date_str, status):
         """
@@ -136,8 +307,37 @@ class DateStatus:
             VALUES (%s, %s)
         """
         result = send_sql_command(query, (date_str, status))
+        bump_calendar_version()
         return result if result else None
 
+    @staticmethod
+    def bulk_upsert_date_statuses(statuses):
+        """
+        Insere ou atualiza vários status de datas em um único comando
+
+        Usa um INSERT multi-linhas com ON DUPLICATE KEY UPDATE sobre a
+        chave única de date, executado em uma única transação.
+
+        Args:
+            statuses (list): Lista de tuplas (YYYY-MM-DD, status)
+
+        Returns:
+            bool: True se gravado com sucesso
+        """
+        if not statuses:
+            return True
+
+        query = """
+            INSERT INTO date_status (date, status)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE
+                updated_at = IF(status = VALUES(status), updated_at, CURRENT_TIMESTAMP),
+                status = VALUES(status)
+        """
+        result = send_bulk_command(query, statuses)
+        bump_calendar_version()
+        return result is not None
+
     @staticmethod
     def update_date_status(status_id, status):
         """
@@ -156,6 +356,7 @@ class DateStatus:
             WHERE id = %s
         """
         result = send_sql_command(query, (status, status_id))
+        bump_calendar_version()
         return result is not None
 
     @staticmethod
@@ -188,6 +389,7 @@ class DateStatus:
             """
             result = send_sql_command(query, (date_str, status))
 
+        bump_calendar_version()
         return result is not None
 
     @staticmethod
@@ -203,6 +405,7 @@ class DateStatus:
         """
         query = "DELETE FROM date_status WHERE id = %s"
         result = send_sql_command(query, (status_id,))
+        bump_calendar_version()
         return result is not None
 
     @staticmethod
@@ -218,6 +421,7 @@ class DateStatus:
         """
         query = "DELETE FROM date_status WHERE date = %s"
         result = send_sql_command(query, (date_str,))
+        bump_calendar_version()
         return result is not None
 
     @staticmethod
@@ -250,15 +454,15 @@ class DateStatus:
         if year and status:
             query = """
                 SELECT COUNT(*) FROM date_status
-                WHERE YEAR(date) = %s AND status = %s
+                WHERE date >= %s AND date < %s AND status = %s
             """
-            result = send_sql_command(query, (year, status))
+            result = send_sql_command(query, year_bounds(year) + (status,))
         elif year:
             query = """
                 SELECT COUNT(*) FROM date_status
-                WHERE YEAR(date) = %s
+                WHERE date >= %s AND date < %s
             """
-            result = send_sql_command(query, (year,))
+            result = send_sql_command(query, year_bounds(year))
         elif status:
             query = """
                 SELECT COUNT(*) FROM date_status
@@ -283,31 +487,43 @@ class DateStatus:
             dict: Dicionário com estatísticas
         """
         if year:
-            query = """
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 1 THEN 1 ELSE 0 END) as status_1,
-                    SUM(CASE WHEN status = 2 THEN 1 ELSE 0 END) as status_2,
-                    SUM(CASE WHEN status = 3 THEN 1 ELSE 0 END) as status_3,
-                    SUM(CASE WHEN status = 4 THEN 1 ELSE 0 END) as status_4,
-                    SUM(CASE WHEN status = 5 THEN 1 ELSE 0 END) as status_5,
-                    SUM(CASE WHEN status = 6 THEN 1 ELSE 0 END) as status_6
-                FROM date_status
-                WHERE YEAR(date) = %s
-            """
-            result = send_sql_command(query, (year,))
+            return DateStatus.get_date_status_statistics_by_year_range(year, year)
+        return cached('date_stats', 'all', DateStatus._select_statistics, Config.STATISTICS_CACHE_TTL)
+
+    @staticmethod
+    def get_date_status_statistics_by_year_range(start_year, end_year):
+        """
+        Retorna estatísticas dos status de datas de um intervalo de anos
+
+        Args:
+            start_year (int): Ano inicial
+            end_year (int): Ano final (inclusivo)
+
+        Returns:
+            dict: Dicionário com estatísticas
+        """
+        return cached('date_stats', f'{start_year}-{end_year}',
+                      lambda: DateStatus._select_statistics(*year_bounds(start_year, end_year)),
+                      Config.STATISTICS_CACHE_TTL)
+
+    @staticmethod
+    def _select_statistics(start=None, end=None):
+        """Executa a contagem por status, opcionalmente em [start, end)"""
+        query = """
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN status = 1 THEN 1 ELSE 0 END) as status_1,
+                SUM(CASE WHEN status = 2 THEN 1 ELSE 0 END) as status_2,
+                SUM(CASE WHEN status = 3 THEN 1 ELSE 0 END) as status_3,
+                SUM(CASE WHEN status = 4 THEN 1 ELSE 0 END) as status_4,
+                SUM(CASE WHEN status = 5 THEN 1 ELSE 0 END) as status_5,
+                SUM(CASE WHEN status = 6 THEN 1 ELSE 0 END) as status_6
+            FROM date_status
+        """
+        if start and end:
+            query += " WHERE date >= %s AND date < %s"
+            result = send_sql_command(query, (start, end))
         else:
-            query = """
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 1 THEN 1 ELSE 0 END) as status_1,
-                    SUM(CASE WHEN status = 2 THEN 1 ELSE 0 END) as status_2,
-                    SUM(CASE WHEN status = 3 THEN 1 ELSE 0 END) as status_3,
-                    SUM(CASE WHEN status = 4 THEN 1 ELSE 0 END) as status_4,
-                    SUM(CASE WHEN status = 5 THEN 1 ELSE 0 END) as status_5,
-                    SUM(CASE WHEN status = 6 THEN 1 ELSE 0 END) as status_6
-                FROM date_status
-            """
             result = send_sql_command(query)
 
         if result:
@@ -342,15 +558,95 @@ class DateStatus:
         Returns:
             dict: Dicionário com formato {YYYY-MM-DD: status}
         """
-        statuses = DateStatus.select_all_date_statuses(year)
+        return DateStatus.get_statuses_for_year_range(year, year).get(int(year), {})
+
+    @staticmethod
+    def get_statuses_for_year_range(start_year, end_year):
+        """
+        Retorna os status de datas de um intervalo de anos agrupados por ano
+
+        Args:
+            start_year (int): Ano inicial
+            end_year (int): Ano final (inclusivo)
+
+        Returns:
+            dict: Dicionário com formato {ano: {YYYY-MM-DD: status}}
+
+        Raises:
+            RuntimeError: Se a consulta falhar (um ano vazio não é erro)
+        """
+        statuses = DateStatus.select_date_statuses_by_year_range(start_year, end_year)
         result = {}
 
+        if statuses == "0":
+            raise RuntimeError("Falha ao consultar os status de datas")
+        if not statuses:
+            return result
+
         for status_data in statuses:
             date_str = status_data[1].isoformat() if hasattr(status_data[1], 'isoformat') else str(status_data[1])
-            result[date_str] = status_data[2]
+            result.setdefault(int(date_str[:4]), {})[date_str] = status_data[2]
 
         return result
 
+    @staticmethod
+    def get_year_calendar(year):
+        """
+        Retorna o calendário compacto de um ano, usando o cache em memória
+
+        O ano é carregado uma vez via get_statuses_for_year e reaproveitado
+        até qualquer escrita em date_status incrementar a versão (ou até
+        expirar CALENDAR_CACHE_TTL, que limita a defasagem entre processos).
+        Uma falha no carregamento é propagada e nada fica em cache.
+
+        Args:
+            year (int): Ano desejado
+
+        Returns:
+            YearCalendar: Status e contagens do ano
+
+        Raises:
+            RuntimeError: Se a consulta ao banco falhar
+        """
+        year = int(year)
+        version = _calendar_version
+        calendar = _year_calendars.get(year)
+        if calendar and calendar.is_fresh(version):
+            return calendar
+
+        calendar = YearCalendar(year, version, DateStatus.get_statuses_for_year(year))
+        with _calendar_lock:
+            # Só guarda se nenhuma escrita ocorreu durante o carregamento
+            if _calendar_version == version:
+                _year_calendars[year] = calendar
+        return calendar
+
+    @staticmethod
+    def get_cached_statuses_for_year(year):
+        """
+        Versão em cache de get_statuses_for_year
+
+        Args:
+            year (int): Ano desejado
+
+        Returns:
+            dict: Dicionário com formato {YYYY-MM-DD: status}
+        """
+        return DateStatus.get_year_calendar(year).to_dict()
+
+    @staticmethod
+    def get_cached_statistics_for_year(year):
+        """
+        Estatísticas de um ano calculadas a partir do calendário em cache
+
+        Args:
+            year (int): Ano desejado
+
+        Returns:
+            dict: Dicionário com estatísticas
+        """
+        return DateStatus.get_year_calendar(year).statistics()
+
     @staticmethod
     def clear_year_statuses(year):
         """
@@ -364,7 +660,8 @@ class DateStatus:
         """
         query = """
             DELETE FROM date_status
-            WHERE YEAR(date) = %s
+            WHERE date >= %s AND date < %s
         """
-        result = send_sql_command(query, (year,))
+        result = send_sql_command(query, year_bounds(year))
+        bump_calendar_version()
         return result is not None
\ No newline at end of file
@@ -1,7 +1,73 @@
-from utils.mysqlUtils import send_sql_command, connect_to_db
+from utils.mysqlUtils import send_sql_command, connect_to_db, send_bulk_command, transaction, stream_sql, iter_chunks
+from utils.row_types import row_type, wrap, wrap_one
+from utils.cache import cached, invalidate
+from utils.identity_map import lookup, evict
+from utils.config import Config
+from utils.request_utils import normalize_ids
+from models.course_model import CourseRow
+from models.student_model import StudentRow
+from models.teacher_model import TeacherRoleRow
+
+PROJECT_COLUMNS = ('id', 'name', 'description', 'course_id', 'observation', 'status', 'created_at', 'updated_at')
+ProjectRow = row_type('ProjectRow', PROJECT_COLUMNS)
+
+
+# Chaves das estatísticas para cada status de projeto
+STATUS_STATISTICS_KEYS = {
+    'Pré-projeto': 'pre_projeto',
+    'Qualificação': 'qualificacao',
+    'Defesa': 'defesa',
+    'Finalizado': 'finalizado',
+    'Trancado': 'trancado',
+}
+
+
+def summarize_status_counts(counts):
+    """
+    Monta o dicionário de estatísticas a partir de {status: quantidade}
+
+    Args:
+        counts (dict): Quantidade de projetos por status
+
+    Returns:
+        dict: total e uma chave por status conhecido
+    """
+    stats = {'total': sum(counts.values())}
+    for status, key in STATUS_STATISTICS_KEYS.items():
+        stats[key] = counts.get(status, 0)
+    return stats
+
+
+def group_status_counts(rows, id_key, name_key):
+    """
+    Agrupa linhas (id, nome, status, quantidade) em um dict por entidade
+
+    Args:
+        rows: Resultado de send_sql_command
+        id_key (str): Nome da chave do id no resultado
+        name_key (str): Nome da chave do nome no resultado
+
+    Returns:
+        list: Estatísticas por entidade, na ordem da consulta, ou None em erro
+    """
+    if rows == "0":
+        return None
+    groups = {}
+    for entity_id, name, status, total in rows or []:
+        group = groups.setdefault(entity_id, {'name': name, 'counts': {}})
+        if status is not None and total:
+            group['counts'][status] = total
+    result = []
+    for entity_id, group in groups.items():
+        stats = {id_key: entity_id, name_key: group['name']}
+        stats.update(summarize_status_counts(group['counts']))
+        result.append(stats)
+    return result
 
 
 class Project:
+    __slots__ = ('id', 'name', 'description', 'status', 'course_id', 'observation')
+
     def __init__(self, id, name, description, course_id, observation, status):
         self.id = id
         self.name = name
@@ -35,7 +101,7 @@ class Project:
                 FROM projects 
                 ORDER BY name ASC
             """
-            return send_sql_command(query)
+            return wrap(ProjectRow, send_sql_command(query))
         else:
             query = """
                 SELECT id, name, description, course_id, observation, status, created_at, updated_at 
@@ -43,7 +109,7 @@ class Project:
                 WHERE status = %s
                 ORDER BY name ASC
             """
-            return send_sql_command(query, (status,))
+            return wrap(ProjectRow, send_sql_command(query, (status,)))
 
     @staticmethod
     def select_projects_by_student(user_id, status='Pré-projeto'):
@@ -67,10 +133,10 @@ class Project:
         if status != 'all':
             query += " AND p.status = %s"
             query += " ORDER BY p.name ASC"
-            return send_sql_command(query, (user_id, status))
+            return wrap(ProjectRow, send_sql_command(query, (user_id, status)))
         else:
             query += " ORDER BY p.name ASC"
-            return send_sql_command(query, (user_id,))
+            return wrap(ProjectRow, send_sql_command(query, (user_id,)))
 
     @staticmethod
     def select_projects_by_teacher(user_id, status='Pré-projeto'):
@@ -94,10 +160,10 @@ class Project:
         if status != 'all':
             query += " AND p.status = %s"
             query += " ORDER BY p.name ASC"
-            return send_sql_command(query, (user_id, status))
+            return wrap(ProjectRow, send_sql_command(query, (user_id, status)))
         else:
             query += " ORDER BY p.name ASC"
-            return send_sql_command(query, (user_id,))
+            return wrap(ProjectRow, send_sql_command(query, (user_id,)))
 
 
     @staticmethod
@@ -109,30 +175,84 @@ class Project:
             project_id (int): ID do projeto
 
         Returns:
-            tuple: Dados do projeto ou None se não encontrado
+            ProjectRow: Dados do projeto ou None se não encontrado
         """
+        return lookup('project', project_id, lambda: Project._select_project_by_id(project_id))
+
+    @staticmethod
+    def _select_project_by_id(project_id):
         query = """
             SELECT id, name, description, course_id, observation, status, created_at, updated_at 
             FROM projects 
             WHERE id = %s
             ORDER BY name ASC
         """
+        return wrap_one(ProjectRow, send_sql_command(query, (project_id,)))
+
+    @staticmethod
+    def get_version(project_id):
+        """
+        Consulta barata de versão do projeto e de tudo que a resposta embute
+
+        Para o projeto e o curso (uma linha cada, pela chave primária) usa
+        updated_at e um CRC32 das colunas exibidas, que diferencia duas
+        escritas no mesmo segundo. Para relatórios, professores e alunos usa
+        só COUNT(*) e MAX(updated_at) pelos índices de project_id, sem ler as
+        colunas de texto: inclusões e remoções mudam a contagem e edições
+        mudam o MAX. Nos vínculos entra também um checksum dos ids (lido do
+        próprio índice), para a troca de um professor ou aluno por outro com
+        a mesma contagem mudar a versão. Duas edições do mesmo registro relacionado no mesmo
+        segundo, ou mudanças só em users (sem updated_at), não mudam a
+        versão.
+
+        Args:
+            project_id (int): ID do projeto
+
+        Returns:
+            tuple: Componentes da versão ou None se o projeto não existe
+
+        Raises:
+            RuntimeError: Se a consulta falhar (não confundir com 404)
+        """
+        query = """
+            SELECT
+                COALESCE(p.updated_at, p.created_at),
+                CRC32(CONCAT_WS('|', p.name, p.description, p.course_id, p.observation, p.status)),
+                (SELECT CONCAT(COALESCE(c.updated_at, c.created_at), ':',
+                               CRC32(CONCAT_WS('|', c.name, c.observation, c.status,
+                                               c.responsible_teacher_name, c.responsible_signature_url)))
+                 FROM course c WHERE c.id = p.course_id),
+                (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(COALESCE(r.updated_at, r.created_at)), ''))
+                 FROM report r WHERE r.project_id = p.id),
+                (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(COALESCE(t.updated_at, t.created_at)), ''), ':',
+                               COALESCE(BIT_XOR(CRC32(CONCAT(tp.teacher_id, ':', tp.role))), 0))
+                 FROM teacher_project tp
+                 INNER JOIN teachers t ON t.id = tp.teacher_id
+                 WHERE tp.project_id = p.id),
+                (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(COALESCE(s.updated_at, s.created_at)), ''), ':',
+                               COALESCE(BIT_XOR(CRC32(sp.student_id)), 0))
+                 FROM student_project sp
+                 INNER JOIN students s ON s.id = sp.student_id
+                 WHERE sp.project_id = p.id)
+            FROM projects p
+            WHERE p.id = %s
+        """
         result = send_sql_command(query, (project_id,))
-        print("="* 60)
-        print(result)
-        return result[0] if result != 0 else None
+        if result == "0":
+            raise RuntimeError("Falha ao consultar a versão do projeto")
+        return result[0] if result else None
 
     @staticmethod
     def get_project_course(project_id):
         """Busca o curso vinculado ao projeto"""
         query = """
-            SELECT c.id, c.name, c.observation, c.status, c.created_at, c.updated_at
+            SELECT c.id, c.name, c.observation, c.status, c.created_at, c.updated_at,
+                   c.responsible_teacher_name, c.responsible_signature_url
             FROM course c
             INNER JOIN projects p ON p.course_id = c.id
             WHERE p.id = %s
         """
-        result = send_sql_command(query, (project_id,))
-        return result[0] if result else None
+        return wrap_one(CourseRow, send_sql_command(query, (project_id,)))
 
     @staticmethod
     def get_project_teachers(project_id):
@@ -145,7 +265,7 @@ class Project:
             WHERE tp.project_id = %s
             ORDER BY t.name ASC
         """
-        return send_sql_command(query, (project_id,))
+        return wrap(TeacherRoleRow, send_sql_command(query, (project_id,)))
 
     @staticmethod
     def get_project_teachers_by_role(project_id, role):
@@ -158,20 +278,20 @@ class Project:
             WHERE tp.project_id = %s AND tp.role = %s
             ORDER BY t.name ASC
         """
-        return send_sql_command(query, (project_id, role))
+        return wrap(TeacherRoleRow, send_sql_command(query, (project_id, role)))
 
     @staticmethod
     def get_project_students(project_id):
         """Busca todos os alunos do projeto"""
         query = """
             SELECT s.id, s.name, s.registration, s.observation, s.image,
-                   s.status, s.user_id, s.created_at, s.updated_at
+                   s.status, s.user_id, s.created_at, s.updated_at, s.telephone
             FROM students s
             INNER JOIN student_project ps ON ps.student_id = s.id
             WHERE ps.project_id = %s
             ORDER BY s.name ASC
         """
-        return send_sql_command(query, (project_id,))
+        return wrap(StudentRow, send_sql_command(query, (project_id,)))
 
     @staticmethod
     def get_project_reports(project_id):
@@ -189,18 +309,124 @@ class Project:
         return send_sql_command(query, (project_id,))
 
     @staticmethod
-    def insert_project(name, description=None, course_id=None, observation=None, status='Pré-projeto'):
-        """Insere um novo projeto"""
+    def stream_projects_for_export(status='all', chunk_size=200):
+        """
+        Percorre os projetos com cursor server-side, em blocos
+
+        As linhas vêm de stream_sql, então a memória não cresce com o número
+        de projetos.
+
+        Args:
+            status (str): Status dos projetos ou 'all'
+            chunk_size (int): Projetos por bloco
+
+        Yields:
+            list: Tuplas (id, name, description, course_id, course_name,
+                  observation, status, created_at, updated_at)
+        """
         query = """
-            INSERT INTO projects (name, description, course_id, observation, status)
-            VALUES (%s, %s, %s, %s, %s)
+            SELECT p.id, p.name, p.description, p.course_id, c.name,
+                   p.observation, p.status, p.created_at, p.updated_at
+            FROM projects p
+            LEFT JOIN course c ON c.id = p.course_id
         """
-        result = send_sql_command(query, (name, description, course_id, observation, status))
-        return result if result else None
+        args = ()
+        if status != 'all':
+            query += " WHERE p.status = %s"
+            args = (status,)
+        query += " ORDER BY p.id ASC"
+
+        return iter_chunks(stream_sql(query, args, chunk_size), chunk_size)
+
+    @staticmethod
+    def get_export_relations(project_ids):
+        """
+        Busca professores, alunos e relatórios de vários projetos de uma vez
+
+        Args:
+            project_ids (list): IDs dos projetos do bloco
+
+        Returns:
+            dict: {project_id: {'advisors', 'guests', 'students', 'reports'}}
+        """
+        relations = {project_id: {'advisors': [], 'guests': [], 'students': [], 'reports': []}
+                     for project_id in project_ids}
+        if not project_ids:
+            return relations
+        placeholders = ", ".join(["%s"] * len(project_ids))
+
+        teachers = send_sql_command(f"""
+            SELECT tp.project_id, tp.role, t.id, t.name, u.username
+            FROM teacher_project tp
+            INNER JOIN teachers t ON t.id = tp.teacher_id
+            LEFT JOIN users u ON u.id = t.user_id
+            WHERE tp.project_id IN ({placeholders})
+            ORDER BY t.name ASC
+        """, tuple(project_ids))
+        for project_id, role, teacher_id, name, email in teachers if teachers not in (0, "0") else []:
+            key = 'guests' if role == 'guest' else 'advisors'
+            relations[project_id][key].append({'id': teacher_id, 'name': name, 'email': email})
+
+        students = send_sql_command(f"""
+            SELECT sp.project_id, s.id, s.name, s.registration, u.username
+            FROM student_project sp
+            INNER JOIN students s ON s.id = sp.student_id
+            LEFT JOIN users u ON u.id = s.user_id
+            WHERE sp.project_id IN ({placeholders})
+            ORDER BY s.name ASC
+        """, tuple(project_ids))
+        for project_id, student_id, name, registration, email in students if students not in (0, "0") else []:
+            relations[project_id]['students'].append({
+                'id': student_id, 'name': name, 'registration': registration, 'email': email
+            })
+
+        reports = send_sql_command(f"""
+            SELECT r.project_id, r.id, r.description, r.pendency, r.status, r.next_steps,
+                   r.local, r.feedback, t.name, r.created_at
+            FROM report r
+            LEFT JOIN teachers t ON t.id = r.teacher_id
+            WHERE r.project_id IN ({placeholders})
+            ORDER BY r.created_at DESC
+        """, tuple(project_ids))
+        for row in reports if reports not in (0, "0") else []:
+            relations[row[0]]['reports'].append({
+                'id': row[1],
+                'description': row[2],
+                'pendency': row[3],
+                'status': row[4],
+                'next_steps': row[5],
+                'local': row[6],
+                'feedback': row[7],
+                'teacher_name': row[8],
+                'created_at': row[9]
+            })
+
+        return relations
+
+    @staticmethod
+    def insert_project(name, description=None, course_id=None, observation=None, status='Pré-projeto'):
+        """Insere um novo projeto e atualiza o contador do status na mesma transação"""
+        try:
+            with transaction() as (connection, cursor):
+                cursor.execute("""
+                    INSERT INTO projects (name, description, course_id, observation, status)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (name, description, course_id, observation, status))
+                project_id = int(cursor.lastrowid)
+                cursor.execute("""
+                    INSERT INTO project_status_counters (status, total)
+                    SELECT COALESCE(status, ''), 1 FROM projects WHERE id = %s
+                    ON DUPLICATE KEY UPDATE total = total + 1
+                """, (project_id,))
+        except Exception as e:
+            print(f"[ERROR] insert_project: {e}")
+            return None
+        invalidate('project_stats', 'project_group_stats')
+        return project_id or None
 
     @staticmethod
     def update_project(project_id, name=None, description=None, course_id=None, observation=None, status=None):
-        """Atualiza os dados de um projeto"""
+        """Atualiza os dados de um projeto (e os contadores, se o status mudar)"""
         updates = []
         params = []
 
@@ -234,15 +460,102 @@ class Project:
             WHERE id = %s
         """
 
-        result = send_sql_command(query, tuple(params))
-        return result is not None
+        try:
+            with transaction() as (connection, cursor):
+                old_status = None
+                if status is not None:
+                    cursor.execute("SELECT COALESCE(status, '') FROM projects WHERE id = %s FOR UPDATE",
+                                   (project_id,))
+                    row = cursor.fetchone()
+                    old_status = row[0] if row else None
+
+                cursor.execute(query, tuple(params))
+
+                if old_status is not None and old_status != status:
+                    Project._move_status_counter(cursor, old_status, status)
+        except Exception as e:
+            print(f"[ERROR] update_project: {e}")
+            return False
+        evict('project', project_id)
+        invalidate('project_stats', 'project_group_stats')
+        return True
 
     @staticmethod
     def delete_project(project_id):
-        """Remove um projeto do banco de dados"""
-        query = "DELETE FROM projects WHERE id = %s"
-        result = send_sql_command(query, (project_id,))
-        return result is not None
+        """Remove um projeto do banco de dados e decrementa o contador do status"""
+        try:
+            with transaction() as (connection, cursor):
+                cursor.execute("SELECT COALESCE(status, '') FROM projects WHERE id = %s FOR UPDATE",
+                               (project_id,))
+                row = cursor.fetchone()
+                cursor.execute("DELETE FROM projects WHERE id = %s", (project_id,))
+                if row and cursor.rowcount:
+                    Project._move_status_counter(cursor, row[0], None)
+        except Exception as e:
+            print(f"[ERROR] delete_project: {e}")
+            return False
+        evict('project', project_id)
+        invalidate('project_stats', 'project_group_stats')
+        return True
+
+    @staticmethod
+    def _move_status_counter(cursor, old_status, new_status):
+        """Transfere um projeto de old_status para new_status nos contadores"""
+        if old_status is not None:
+            cursor.execute("""
+                UPDATE project_status_counters
+                SET total = GREATEST(total - 1, 0)
+                WHERE status = %s
+            """, (old_status,))
+        if new_status is not None:
+            cursor.execute("""
+                INSERT INTO project_status_counters (status, total)
+                VALUES (%s, 1)
+                ON DUPLICATE KEY UPDATE total = total + 1
+            """, (new_status,))
+
+    @staticmethod
+    def reconcile_status_counters():
+        """
+        Recalcula os contadores de status a partir da tabela projects
+
+        Corrige apenas os status com divergência, dentro de uma transação.
+
+        Returns:
+            dict: {status: (contador anterior, valor correto)} das correções,
+                  ou None em caso de erro
+        """
+        try:
+            with transaction() as (connection, cursor):
+                cursor.execute("SELECT status, total FROM project_status_counters FOR UPDATE")
+                counters = dict(cursor.fetchall())
+                cursor.execute("""
+                    SELECT COALESCE(status, ''), COUNT(*)
+                    FROM projects
+                    GROUP BY COALESCE(status, '')
+                    LOCK IN SHARE MODE
+                """)
+                actual = dict(cursor.fetchall())
+
+                drift = {}
+                for status in set(counters) | set(actual):
+                    expected = actual.get(status, 0)
+                    if counters.get(status, 0) != expected:
+                        drift[status] = (counters.get(status, 0), expected)
+
+                if drift:
+                    send_bulk_command("""
+                        INSERT INTO project_status_counters (status, total)
+                        VALUES (%s, %s)
+                        ON DUPLICATE KEY UPDATE total = VALUES(total)
+                    """, [(status, expected) for status, (_, expected) in drift.items()], cursor=cursor)
+        except Exception as e:
+            print(f"[ERROR] reconcile_status_counters: {e}")
+            return None
+
+        if drift:
+            invalidate('project_stats')
+        return drift
 
     @staticmethod
     def check_project_exists(project_id):
@@ -263,6 +576,7 @@ class Project:
             VALUES (%s, %s)
         """
         result = send_sql_command(query, (project_id, teacher_id))
+        invalidate('project_group_stats')
         return result is not None
 
     @staticmethod
@@ -273,8 +587,78 @@ class Project:
             VALUES (%s, %s, %s)
         """
         result = send_sql_command(query, (project_id, teacher_id, role))
+        invalidate('project_group_stats')
         return result is not None
 
+    @staticmethod
+    def add_teachers_to_project_batch(project_id, teacher_ids, role='advisor', blocked_role=None):
+        """
+        Adiciona vários professores ao projeto em lote (idempotente)
+
+        Em uma única conexão/transação: uma consulta identifica professores
+        inexistentes e vínculos já existentes, e um INSERT IGNORE multi-linhas
+        grava os demais (a chave única (project_id, teacher_id) garante a
+        idempotência). Se algum professor já estiver no projeto com
+        blocked_role, nada é gravado.
+
+        Args:
+            project_id (int): ID do projeto
+            teacher_ids (list): IDs dos professores
+            role (str): Role dos novos vínculos ('advisor' ou 'guest')
+            blocked_role (str, optional): Role que impede a inclusão
+
+        Returns:
+            dict: Listas 'added', 'skipped', 'invalid' e 'blocked',
+                  ou None em caso de erro
+        """
+        ids, invalid = normalize_ids(teacher_ids)
+        report = {'added': [], 'skipped': [], 'invalid': invalid, 'blocked': []}
+        if not ids:
+            return report
+
+        try:
+            with transaction() as (connection, cursor):
+                Project._add_teachers_batch(cursor, project_id, ids, role, blocked_role, report)
+        except Exception as e:
+            print(f"[ERROR] add_teachers_to_project_batch: {e}")
+            return None
+        if report['added']:
+            invalidate('project_group_stats')
+        return report
+
+    @staticmethod
+    def _add_teachers_batch(cursor, project_id, ids, role, blocked_role, report):
+        """Consulta os vínculos e grava os novos professores na transação informada"""
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"""
+            SELECT t.id, tp.role
+            FROM teachers t
+            LEFT JOIN teacher_project tp ON tp.teacher_id = t.id AND tp.project_id = %s
+            WHERE t.id IN ({placeholders})
+        """, (project_id, *ids))
+        memberships = {row[0]: row[1] for row in cursor.fetchall()}
+
+        to_add = []
+        for teacher_id in ids:
+            if teacher_id not in memberships:
+                report['invalid'].append(teacher_id)
+            elif blocked_role and memberships[teacher_id] == blocked_role:
+                report['blocked'].append(teacher_id)
+            elif memberships[teacher_id] is not None:
+                report['skipped'].append(teacher_id)
+            else:
+                to_add.append(teacher_id)
+
+        if report['blocked'] or not to_add:
+            return report
+
+        send_bulk_command("""
+            INSERT IGNORE INTO teacher_project (project_id, teacher_id, role)
+            VALUES (%s, %s, %s)
+        """, [(project_id, teacher_id, role) for teacher_id in to_add], cursor=cursor)
+        report['added'] = to_add
+        return report
+
     @staticmethod
     def remove_teacher_from_project(project_id, teacher_id):
         """Remove um professor do projeto"""
@@ -283,6 +667,7 @@ class Project:
             WHERE project_id = %s AND teacher_id = %s
         """
         result = send_sql_command(query, (project_id, teacher_id))
+        invalidate('project_group_stats')
         return result is not None
 
     @staticmethod
@@ -331,6 +716,65 @@ class Project:
         result = send_sql_command(query, (project_id, student_id))
         return result is not None
 
+    @staticmethod
+    def add_students_to_project_batch(project_id, student_ids):
+        """
+        Adiciona vários alunos ao projeto em lote (idempotente)
+
+        Em uma única conexão/transação: uma consulta identifica alunos
+        inexistentes e vínculos já existentes, e um INSERT IGNORE multi-linhas
+        grava os demais (chave única (project_id, student_id)).
+
+        Args:
+            project_id (int): ID do projeto
+            student_ids (list): IDs dos alunos
+
+        Returns:
+            dict: Listas 'added', 'skipped' e 'invalid', ou None em caso de erro
+        """
+        ids, invalid = normalize_ids(student_ids)
+        report = {'added': [], 'skipped': [], 'invalid': invalid}
+        if not ids:
+            return report
+
+        try:
+            with transaction() as (connection, cursor):
+                return Project._add_students_batch(cursor, project_id, ids, report)
+        except Exception as e:
+            print(f"[ERROR] add_students_to_project_batch: {e}")
+            return None
+
+    @staticmethod
+    def _add_students_batch(cursor, project_id, ids, report):
+        """Consulta os vínculos e grava os novos alunos na transação informada"""
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"""
+            SELECT s.id, sp.id
+            FROM students s
+            LEFT JOIN student_project sp ON sp.student_id = s.id AND sp.project_id = %s
+            WHERE s.id IN ({placeholders})
+        """, (project_id, *ids))
+        memberships = {row[0]: row[1] for row in cursor.fetchall()}
+
+        to_add = []
+        for student_id in ids:
+            if student_id not in memberships:
+                report['invalid'].append(student_id)
+            elif memberships[student_id] is not None:
+                report['skipped'].append(student_id)
+            else:
+                to_add.append(student_id)
+
+        if not to_add:
+            return report
+
+        send_bulk_command("""
+            INSERT IGNORE INTO student_project (project_id, student_id)
+            VALUES (%s, %s)
+        """, [(project_id, student_id) for student_id in to_add], cursor=cursor)
+        report['added'] = to_add
+        return report
+
     @staticmethod
     def remove_student_from_project(project_id, student_id):
         """Remove um aluno do projeto"""
@@ -468,37 +912,85 @@ class Project:
 
     @staticmethod
     def get_project_statistics():
-        """Retorna estatísticas dos projetos"""
+        """
+        Retorna estatísticas dos projetos (em cache até a próxima escrita)
+
+        Returns:
+            dict: Dicionário com estatísticas
+        """
+        return cached('project_stats', 'all', Project._select_project_statistics,
+                      Config.STATISTICS_CACHE_TTL)
+
+    @staticmethod
+    def _select_project_statistics():
+        """
+        Lê as estatísticas da tabela de contadores
+
+        Os contadores são mantidos por insert/update/delete_project; a data do
+        último cadastro vem do índice de projects.created_at.
+        """
         query = """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Pré-projeto' THEN 1 ELSE 0 END) as pre_project,
-                SUM(CASE WHEN status = 'Qualificação' THEN 1 ELSE 0 END) as qualified,
-                SUM(CASE WHEN status = 'Defesa' THEN 1 ELSE 0 END) as thesis_defense,
-                SUM(CASE WHEN status = 'Finalizado' THEN 1 ELSE 0 END) as finalized,
-                SUM(CASE WHEN status = 'Trancado' THEN 1 ELSE 0 END) as locked,
-                MAX(created_at) as ultimo_cadastro
-            FROM projects
+            SELECT c.status, c.total, (SELECT MAX(created_at) FROM projects)
+            FROM project_status_counters c
         """
         result = send_sql_command(query)
+        if result == "0":
+            return None
 
         if result:
-            row = result[0]
-            return {
-                'total': row[0],
-                'pre_projeto': row[1],
-                'qualificacao': row[2],
-                'defesa': row[3],
-                'finalizado': row[4],
-                'trancado': row[5],
-                'ultimo_cadastro': row[6]
-            }
-        return {
-            'total': 0,
-            'pre_projeto': 0,
-            'qualificacao': 0,
-            'defesa': 0,
-            'finalizado': 0,
-            'trancado': 0,
-            'ultimo_cadastro': None
-        }
\ No newline at end of file
+            counts = {row[0]: row[1] for row in result}
+            ultimo_cadastro = result[0][2]
+        else:
+            counts = {}
+            ultimo_cadastro = send_sql_command("SELECT MAX(created_at) FROM projects")
+            ultimo_cadastro = ultimo_cadastro[0][0] if ultimo_cadastro not in (0, "0") else None
+
+        stats = summarize_status_counts(counts)
+        stats['ultimo_cadastro'] = ultimo_cadastro
+        return stats
+
+    @staticmethod
+    def get_statistics_by_course():
+        """
+        Contagem de projetos por status em cada curso (uma consulta agrupada)
+
+        Returns:
+            list: Dicts com course_id, course_name e as contagens por status
+        """
+        return cached('project_group_stats', 'by-course', Project._select_statistics_by_course,
+                      Config.STATISTICS_CACHE_TTL)
+
+    @staticmethod
+    def _select_statistics_by_course():
+        query = """
+            SELECT c.id, c.name, p.status, COUNT(p.id)
+            FROM course c
+            LEFT JOIN projects p ON p.course_id = c.id
+            GROUP BY c.id, c.name, p.status
+            ORDER BY c.name ASC, c.id ASC
+        """
+        return group_status_counts(send_sql_command(query), 'course_id', 'course_name')
+
+    @staticmethod
+    def get_statistics_by_advisor():
+        """
+        Contagem de projetos por status de cada orientador (uma consulta agrupada)
+
+        Returns:
+            list: Dicts com teacher_id, teacher_name e as contagens por status
+        """
+        return cached('project_group_stats', 'by-advisor', Project._select_statistics_by_advisor,
+                      Config.STATISTICS_CACHE_TTL)
+
+    @staticmethod
+    def _select_statistics_by_advisor():
+        query = """
+            SELECT t.id, t.name, p.status, COUNT(DISTINCT p.id)
+            FROM teacher_project tp
+            INNER JOIN teachers t ON t.id = tp.teacher_id
+            INNER JOIN projects p ON p.id = tp.project_id
+            WHERE tp.role = 'advisor'
+            GROUP BY t.id, t.name, p.status
+            ORDER BY t.name ASC, t.id ASC
+        """
+        return group_status_counts(send_sql_command(query), 'teacher_id', 'teacher_name')
@@ -1,6 +1,14 @@
-from utils.mysqlUtils import send_sql_command, connect_to_db
+from utils.mysqlUtils import send_sql_command, connect_to_db, transaction, send_bulk_command
+from utils.password_utils import hash_passwords, DEFAULT_PASSWORD
+from utils.row_types import row_type, wrap, wrap_one
+from utils.cache import invalidate_entity
+from utils.identity_map import lookup, evict
 from werkzeug.security import generate_password_hash
 
+STUDENT_COLUMNS = ('id', 'name', 'registration', 'observation', 'image', 'status',
+                   'user_id', 'created_at', 'updated_at', 'telephone')
+StudentRow = row_type('StudentRow', STUDENT_COLUMNS)
+
 class Student:
     @staticmethod
     def select_all_student():
@@ -15,7 +23,7 @@ class Student:
             FROM students 
             ORDER BY name ASC
         """
-        return send_sql_command(query, ())
+        return wrap(StudentRow, send_sql_command(query, ()))
 
     @staticmethod
     def find_all_by_project(project_id):
@@ -34,7 +42,7 @@ class Student:
             INNER JOIN student_project sp ON s.id = sp.student_id
             WHERE sp.project_id = %s
         """
-        return send_sql_command(query, (project_id,))
+        return wrap(StudentRow, send_sql_command(query, (project_id,)))
 
 
     @staticmethod
@@ -46,15 +54,18 @@ class Student:
             student_id (int): ID do aluno
 
         Returns:
-            tuple: Dados do aluno ou None se não encontrado
+            StudentRow: Dados do aluno ou None se não encontrado
         """
+        return lookup('student', student_id, lambda: Student._select_student_by_id(student_id))
+
+    @staticmethod
+    def _select_student_by_id(student_id):
         query = """
             SELECT id, name, registration, observation, image, status, user_id, created_at, updated_at, telephone 
             FROM students 
             WHERE id = %s
         """
-        result = send_sql_command(query, (student_id,))
-        return result[0] if result != 0 else None
+        return wrap_one(StudentRow, send_sql_command(query, (student_id,)))
 
     @staticmethod
     def select_student_by_user_id(user_id):
@@ -65,15 +76,50 @@ class Student:
             student_id (int): ID do aluno
 
         Returns:
-            tuple: Dados do aluno ou None se não encontrado
+            StudentRow: Dados do aluno ou None se não encontrado
         """
+        return lookup('student_by_user', user_id, lambda: Student._select_student_by_user_id(user_id))
+
+    @staticmethod
+    def _select_student_by_user_id(user_id):
         query = """
             SELECT id, name, registration, observation, image, status, user_id, created_at, updated_at, telephone
             FROM students
             WHERE user_id = %s
         """
-        result = send_sql_command(query, (user_id,))
-        return result[0] if result != 0 else None
+        return wrap_one(StudentRow, send_sql_command(query, (user_id,)))
+
+    @staticmethod
+    def get_version(student_id):
+        """
+        Consulta barata de versão do aluno e do seu usuário, usada para o ETag
+
+        A tabela users não tem updated_at, então entra um checksum das
+        colunas exibidas.
+
+        Args:
+            student_id (int): ID do aluno
+
+        Returns:
+            tuple: (última alteração, checksum do aluno, checksum do usuário)
+                   ou None se não existe
+
+        Raises:
+            RuntimeError: Se a consulta falhar (não confundir com 404)
+        """
+        query = """
+            SELECT COALESCE(s.updated_at, s.created_at),
+                   CRC32(CONCAT_WS('|', s.name, s.registration, s.observation, s.image,
+                                   s.status, s.telephone)),
+                   CRC32(CONCAT_WS('|', u.id, u.username, u.authority, u.status, u.name))
+            FROM students s
+            LEFT JOIN users u ON u.id = s.user_id
+            WHERE s.id = %s
+        """
+        result = send_sql_command(query, (student_id,))
+        if result == "0":
+            raise RuntimeError("Falha ao consultar a versão do aluno")
+        return result[0] if result else None
 
     @staticmethod
     def select_student_by_name(name):
@@ -93,47 +139,58 @@ class Student:
             ORDER BY name ASC
         """
         search_term = f"%{name}%"
-        return send_sql_command(query, (search_term,))
+        return wrap(StudentRow, send_sql_command(query, (search_term,)))
 
     @staticmethod
-    def select_student_by_date_range(start_date=None, end_date=None):
+    def select_student_by_date_range(start_date=None, end_date=None, limit=None, after=None):
         """
         Busca alunos por intervalo de datas de cadastro
 
+        O filtro usa intervalo semiaberto sobre created_at (sem DATE()),
+        permitindo uso do índice (created_at, id). Com limit informado, a
+        paginação é por keyset: after recebe (created_at, id) do último
+        registro da página anterior.
+
         Args:
             start_date (str): Data inicial (formato: YYYY-MM-DD)
-            end_date (str): Data final (formato: YYYY-MM-DD)
+            end_date (str): Data final, inclusiva (formato: YYYY-MM-DD)
+            limit (int, optional): Tamanho da página
+            after (tuple, optional): Cursor (created_at, id) da página anterior
 
         Returns:
             list: Lista de alunos no intervalo de datas
         """
-        if start_date and end_date:
-            query = """
-                SELECT id, name, registration, observation, image, status, user_id, created_at, updated_at, telephone 
-                FROM students 
-                WHERE DATE(created_at) BETWEEN %s AND %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (start_date, end_date))
-        elif start_date:
-            query = """
-                SELECT id, name, registration, observation, image, status, user_id, created_at, updated_at, telephone
-                FROM students 
-                WHERE DATE(created_at) >= %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (start_date))
-        elif end_date:
-            query = """
-                SELECT id, name, registration, observation, image, status, user_id, created_at, updated_at, telephone
-                FROM students 
-                WHERE DATE(created_at) <= %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (end_date))
-        else:
+        conditions = []
+        params = []
+
+        if start_date:
+            conditions.append("created_at >= %s")
+            params.append(start_date)
+
+        if end_date:
+            conditions.append("created_at < DATE_ADD(%s, INTERVAL 1 DAY)")
+            params.append(end_date)
+
+        if after:
+            conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+            params.extend([after[0], after[0], after[1]])
+
+        if not conditions and limit is None:
             return Student.select_all_student()
 
+        query = """
+            SELECT id, name, registration, observation, image, status, user_id, created_at, updated_at, telephone
+            FROM students
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        return wrap(StudentRow, send_sql_command(query, tuple(params)))
+
     @staticmethod
     def insert_student(name, email, registration, observation=None, image=None):
         """
@@ -163,6 +220,85 @@ class Student:
         return None
 
 
+    @staticmethod
+    def load_import_lookups():
+        """
+        Carrega em uma única consulta os emails e RAs já cadastrados
+
+        Usado pela importação em lote para validar duplicidades em memória,
+        sem uma consulta por linha da planilha.
+
+        Returns:
+            tuple: (set de emails, set de RAs) ou None em caso de erro
+        """
+        query = """
+            SELECT 'email', username FROM users
+            UNION ALL
+            SELECT 'ra', registration FROM students
+        """
+        rows = send_sql_command(query, ())
+        if rows == "0":
+            return None
+
+        emails, registrations = set(), set()
+        for kind, value in rows or []:
+            if value is None:
+                continue
+            if kind == 'email':
+                emails.add(value.lower())
+            else:
+                registrations.add(value.lower())
+        return emails, registrations
+
+    @staticmethod
+    def bulk_insert_students(rows):
+        """
+        Insere vários alunos (e seus usuários) em uma única transação
+
+        Os hashes de senha são gerados em paralelo e os INSERTs são enviados
+        em lote; se qualquer etapa falhar, nada é gravado.
+
+        Args:
+            rows (list): Dicts com name, email, registration, observation,
+                         image e telephone já validados
+
+        Returns:
+            dict: {email: student_id} dos alunos inseridos ou None em caso de erro
+        """
+        if not rows:
+            return {}
+
+        try:
+            hashes = hash_passwords([DEFAULT_PASSWORD] * len(rows))
+            emails = [row['email'] for row in rows]
+            placeholders = ", ".join(["%s"] * len(emails))
+
+            with transaction() as (connection, cursor):
+                send_bulk_command("""
+                    INSERT INTO users (username, authority, password_hash, name)
+                    VALUES (%s, %s, %s, %s)
+                """, [(row['email'], 'student', password_hash, row['name'])
+                      for row, password_hash in zip(rows, hashes)], cursor=cursor)
+
+                cursor.execute(f"SELECT id, username FROM users WHERE username IN ({placeholders})",
+                               tuple(emails))
+                user_ids = {username: user_id for user_id, username in cursor.fetchall()}
+
+                send_bulk_command("""
+                    INSERT INTO students (name, registration, observation, image, telephone, user_id)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, [(row['name'], row['registration'], row.get('observation'), row.get('image'),
+                       row.get('telephone'), user_ids[row['email']]) for row in rows], cursor=cursor)
+
+                cursor.execute(f"SELECT id, user_id FROM students WHERE user_id IN ({placeholders})",
+                               tuple(user_ids[email] for email in emails))
+                student_by_user = {user_id: student_id for student_id, user_id in cursor.fetchall()}
+
+            return {email: student_by_user.get(user_ids[email]) for email in emails}
+        except Exception as e:
+            print(f"[ERROR] bulk_insert_students: {e}")
+            return None
+
     @staticmethod
     def update_student_status(student_id, status):
         """
@@ -183,6 +319,7 @@ class Student:
                 WHERE id = %s
             """
             send_sql_command(query, (status, student[6]))
+            invalidate_entity('user', student[6])
             return True
         return False
 
@@ -204,6 +341,7 @@ class Student:
             WHERE id = %s
         """
         send_sql_command(query, (name, student_id))
+        Student._evict_loaded(student_id)
         return True
 
     @staticmethod
@@ -226,6 +364,7 @@ class Student:
                 WHERE id = %s
             """
             send_sql_command(query, (email, student[6]))
+            invalidate_entity('user', student[6])
             return True
         return False
 
@@ -248,6 +387,7 @@ class Student:
             WHERE id = %s
         """
         send_sql_command(query, (observation, image, student_id))
+        Student._evict_loaded(student_id)
         return True
 
     @staticmethod
@@ -259,6 +399,7 @@ class Student:
             WHERE id = %s
         """
         send_sql_command(query, (registration, student_id))
+        Student._evict_loaded(student_id)
         return True
 
     @staticmethod
@@ -270,6 +411,7 @@ class Student:
             WHERE id = %s
         """
         send_sql_command(query, (telephone, student_id))
+        Student._evict_loaded(student_id)
         return True
 
     @staticmethod
@@ -284,6 +426,7 @@ class Student:
             """
         )
         send_sql_command(query, (status, project_id))
+        Student._evict_loaded()
         return True
 
     @staticmethod
@@ -328,8 +471,15 @@ class Student:
         """
         query = "DELETE FROM students WHERE id = %s"
         result = send_sql_command(query, (student_id,))
+        Student._evict_loaded(student_id)
         return result != 0
 
+    @staticmethod
+    def _evict_loaded(*student_ids):
+        """Remove alunos alterados do identity map da requisição (sem ids: todos)"""
+        evict('student', *student_ids)
+        evict('student_by_user')
+
     @staticmethod
     def check_student_exists(student_id):
         """
@@ -1,6 +1,14 @@
-from utils.mysqlUtils import send_sql_command,connect_to_db
+from utils.mysqlUtils import send_sql_command,connect_to_db, transaction, send_bulk_command
+from utils.password_utils import hash_passwords, DEFAULT_PASSWORD
+from utils.row_types import row_type, wrap, wrap_one
+from utils.cache import cached_entity, invalidate_entity, invalidate
+from utils.identity_map import lookup, evict
 from werkzeug.security import generate_password_hash
 
+TEACHER_COLUMNS = ('id', 'name', 'observation', 'image', 'user_id', 'created_at', 'updated_at')
+TeacherRow = row_type('TeacherRow', TEACHER_COLUMNS)
+TeacherRoleRow = row_type('TeacherRoleRow', TEACHER_COLUMNS + ('role',))
+
 
 class Teacher:
     @staticmethod
@@ -16,7 +24,7 @@ class Teacher:
             FROM teachers 
             ORDER BY name ASC
         """
-        return send_sql_command(query, ())
+        return wrap(TeacherRow, send_sql_command(query, ()))
 
     @staticmethod
     def find_all_by_project(project_id):
@@ -35,7 +43,7 @@ class Teacher:
             INNER JOIN teacher_project tp ON t.id = tp.teacher_id
             WHERE tp.project_id = %s
         """
-        return send_sql_command(query, (project_id,))
+        return wrap(TeacherRow, send_sql_command(query, (project_id,)))
 
     @staticmethod
     def find_all_by_project_and_role(project_id, role):
@@ -47,7 +55,7 @@ class Teacher:
             WHERE tp.project_id = %s AND tp.role = %s
             ORDER BY t.name ASC
         """
-        return send_sql_command(query, (project_id, role))
+        return wrap(TeacherRoleRow, send_sql_command(query, (project_id, role)))
 
 
     @staticmethod
@@ -59,17 +67,19 @@ class Teacher:
             teacher_id (int): ID do professor
 
         Returns:
-            tuple: Dados do professor ou None se não encontrado
+            TeacherRow: Dados do professor ou None se não encontrado
         """
+        return lookup('teacher', teacher_id,
+                      lambda: cached_entity('teacher', teacher_id, lambda: Teacher._select_teacher_by_id(teacher_id)))
+
+    @staticmethod
+    def _select_teacher_by_id(teacher_id):
         query = """
             SELECT id, name, observation, image, user_id, created_at, updated_at 
             FROM teachers 
             WHERE id = %s
         """
-        result = send_sql_command(query, (teacher_id,))
-        if result in (0, "0"):
-            return None
-        return result[0] if result else None
+        return wrap_one(TeacherRow, send_sql_command(query, (teacher_id,)))
 
     @staticmethod
     def select_teacher_by_user_id(user_id):
@@ -80,16 +90,48 @@ class Teacher:
             user_id (int): ID do professor
 
         Returns:
-            tuple: Dados do professor ou None se não encontrado
+            TeacherRow: Dados do professor ou None se não encontrado
         """
+        return lookup('teacher_by_user', user_id, lambda: Teacher._select_teacher_by_user_id(user_id))
+
+    @staticmethod
+    def _select_teacher_by_user_id(user_id):
         query = """
             SELECT id, name, observation, image, user_id, created_at, updated_at 
             FROM teachers 
             WHERE user_id = %s
         """
-        result = send_sql_command(query, (user_id,))
-        if result in (0, "0"):
-            return None
+        return wrap_one(TeacherRow, send_sql_command(query, (user_id,)))
+
+    @staticmethod
+    def get_version(teacher_id):
+        """
+        Consulta barata de versão do professor e do seu usuário, usada para o ETag
+
+        A tabela users não tem updated_at, então entra um checksum das
+        colunas exibidas.
+
+        Args:
+            teacher_id (int): ID do professor
+
+        Returns:
+            tuple: (última alteração, checksum do professor, checksum do usuário)
+                   ou None se não existe
+
+        Raises:
+            RuntimeError: Se a consulta falhar (não confundir com 404)
+        """
+        query = """
+            SELECT COALESCE(t.updated_at, t.created_at),
+                   CRC32(CONCAT_WS('|', t.name, t.observation, t.image)),
+                   CRC32(CONCAT_WS('|', u.id, u.username, u.authority, u.status, u.name))
+            FROM teachers t
+            LEFT JOIN users u ON u.id = t.user_id
+            WHERE t.id = %s
+        """
+        result = send_sql_command(query, (teacher_id,))
+        if result == "0":
+            raise RuntimeError("Falha ao consultar a versão do professor")
         return result[0] if result else None
 
     @staticmethod
@@ -110,47 +152,58 @@ class Teacher:
             ORDER BY name ASC
         """
         search_term = f"%{name}%"
-        return send_sql_command(query, (search_term,))
+        return wrap(TeacherRow, send_sql_command(query, (search_term,)))
 
     @staticmethod
-    def select_teacher_by_date_range(start_date=None, end_date=None):
+    def select_teacher_by_date_range(start_date=None, end_date=None, limit=None, after=None):
         """
         Busca professores por intervalo de datas de cadastro
 
+        O filtro usa intervalo semiaberto sobre created_at (sem DATE()),
+        permitindo uso do índice (created_at, id). Com limit informado, a
+        paginação é por keyset: after recebe (created_at, id) do último
+        registro da página anterior.
+
         Args:
             start_date (str): Data inicial (formato: YYYY-MM-DD)
-            end_date (str): Data final (formato: YYYY-MM-DD)
+            end_date (str): Data final, inclusiva (formato: YYYY-MM-DD)
+            limit (int, optional): Tamanho da página
+            after (tuple, optional): Cursor (created_at, id) da página anterior
 
         Returns:
             list: Lista de professores no intervalo de datas
         """
-        if start_date and end_date:
-            query = """
-                SELECT id, name, observation, image, user_id, created_at, updated_at 
-                FROM teachers 
-                WHERE DATE(created_at) BETWEEN %s AND %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (start_date, end_date))
-        elif start_date:
-            query = """
-                SELECT id, name, observation, image, user_id, created_at, updated_at
-                FROM teachers 
-                WHERE DATE(created_at) >= %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (start_date))
-        elif end_date:
-            query = """
-                SELECT id, name, observation, image, user_id, created_at, updated_at
-                FROM teachers 
-                WHERE DATE(created_at) <= %s
-                ORDER BY created_at DESC
-            """
-            return send_sql_command(query, (end_date))
-        else:
+        conditions = []
+        params = []
+
+        if start_date:
+            conditions.append("created_at >= %s")
+            params.append(start_date)
+
+        if end_date:
+            conditions.append("created_at < DATE_ADD(%s, INTERVAL 1 DAY)")
+            params.append(end_date)
+
+        if after:
+            conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+            params.extend([after[0], after[0], after[1]])
+
+        if not conditions and limit is None:
             return Teacher.select_all_teacher()
 
+        query = """
+            SELECT id, name, observation, image, user_id, created_at, updated_at
+            FROM teachers
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        return wrap(TeacherRow, send_sql_command(query, tuple(params)))
+
     @staticmethod
     def insert_teacher(name, email, observation=None, image=None):
         """
@@ -178,6 +231,84 @@ class Teacher:
             return result if result != 0 else None
         return None
 
+    @staticmethod
+    def find_existing_usernames(emails):
+        """
+        Busca, em uma única consulta, quais emails já são usuários
+
+        Args:
+            emails (list): Emails/logins a verificar
+
+        Returns:
+            set: Emails já cadastrados (minúsculos) ou None em caso de erro
+        """
+        if not emails:
+            return set()
+        placeholders = ", ".join(["%s"] * len(emails))
+        query = f"SELECT username FROM users WHERE username IN ({placeholders})"
+        result = send_sql_command(query, tuple(emails))
+        if result == "0":
+            return None
+        return {row[0].lower() for row in result} if result else set()
+
+    @staticmethod
+    def bulk_insert_teachers(teachers):
+        """
+        Insere vários professores, seus usuários e vínculos com cursos
+
+        Tudo roda em uma única transação com INSERTs multi-linhas; se qualquer
+        etapa falhar, nada é gravado.
+
+        Args:
+            teachers (list): Dicts com name, email, observation, image e
+                             course_ids (ids já validados)
+
+        Returns:
+            dict: {email: teacher_id} dos professores inseridos ou None em caso de erro
+        """
+        if not teachers:
+            return {}
+
+        try:
+            hashes = hash_passwords([DEFAULT_PASSWORD] * len(teachers))
+            emails = [teacher['email'] for teacher in teachers]
+            placeholders = ", ".join(["%s"] * len(emails))
+
+            with transaction() as (connection, cursor):
+                send_bulk_command("""
+                    INSERT INTO users (username, authority, password_hash, name)
+                    VALUES (%s, %s, %s, %s)
+                """, [(teacher['email'], 'teacher', password_hash, teacher['name'])
+                      for teacher, password_hash in zip(teachers, hashes)], cursor=cursor)
+
+                cursor.execute(f"SELECT id, username FROM users WHERE username IN ({placeholders})",
+                               tuple(emails))
+                user_ids = {username: user_id for user_id, username in cursor.fetchall()}
+
+                send_bulk_command("""
+                    INSERT INTO teachers (name, observation, image, user_id)
+                    VALUES (%s, %s, %s, %s)
+                """, [(teacher['name'], teacher.get('observation'), teacher.get('image'),
+                       user_ids[teacher['email']]) for teacher in teachers], cursor=cursor)
+
+                cursor.execute(f"SELECT id, user_id FROM teachers WHERE user_id IN ({placeholders})",
+                               tuple(user_ids[email] for email in emails))
+                teacher_by_user = {user_id: teacher_id for teacher_id, user_id in cursor.fetchall()}
+                teacher_ids = {email: teacher_by_user[user_ids[email]] for email in emails}
+
+                links = [(teacher_ids[teacher['email']], course_id)
+                         for teacher in teachers for course_id in teacher.get('course_ids', [])]
+                if links:
+                    send_bulk_command("""
+                        INSERT IGNORE INTO teacher_course (teacher_id, course_id)
+                        VALUES (%s, %s)
+                    """, links, cursor=cursor)
+
+            return teacher_ids
+        except Exception as e:
+            print(f"[ERROR] bulk_insert_teachers: {e}")
+            return None
+
     @staticmethod
     def update_teacher_status(teacher_id, status):
         """
@@ -198,6 +329,7 @@ class Teacher:
                 WHERE id = %s
             """
             send_sql_command(query, (status, teacher[4]))
+            invalidate_entity('user', teacher[4])
             return True
         return False
 
@@ -219,6 +351,9 @@ class Teacher:
             WHERE id = %s
         """
         send_sql_command(query, (name, teacher_id))
+        invalidate_entity('teacher', teacher_id)
+        evict('teacher_by_user')
+        invalidate('project_group_stats')
         return True
 
     @staticmethod
@@ -241,6 +376,7 @@ class Teacher:
                 WHERE id = %s
             """
             send_sql_command(query, (email, teacher[4]))
+            invalidate_entity('user', teacher[4])
             return True
         return False
 
@@ -263,6 +399,8 @@ class Teacher:
             WHERE id = %s
         """
         send_sql_command(query, (observation, image, teacher_id))
+        invalidate_entity('teacher', teacher_id)
+        evict('teacher_by_user')
         return True
 
     @staticmethod
@@ -307,6 +445,10 @@ class Teacher:
         """
         query = "DELETE FROM teachers WHERE id = %s"
         result = send_sql_command(query, (teacher_id,))
+        invalidate_entity('teacher', teacher_id)
+        evict('teacher_by_user')
+        # O cascade remove os vínculos de orientação
+        invalidate('project_group_stats')
         return result != 0
 
     @staticmethod
@@ -1,7 +1,11 @@
-from utils.mysqlUtils import send_sql_command,connect_to_db
+from utils.mysqlUtils import send_sql_command,connect_to_db, stream_sql
+from utils.cache import cached_entity, invalidate_entity
+from utils.identity_map import lookup, get_loaded
 
 
 class User:
+    __slots__ = ('id', 'username', 'authority', 'password_hash', 'status', 'name')
+
     def __init__(self, id, username, authority, password_hash, status, name=None):
         self.id = id
         self.username = username
@@ -27,22 +31,19 @@ class User:
             return None
         row = result[0] if result else None
         if row:
-            return User(row[0], row[1], row[2], row[3], row[4], row[5] if len(row) > 5 else None)
+            return User(*row)
         return None
 
     @staticmethod
     def delete_user(user_id,active):
         send_sql_command("UPDATE users set active =%s where id =%s",(active,user_id))
+        invalidate_entity('user', user_id)
 
     @staticmethod
     def find_by_id(user_id):
-        result = send_sql_command("SELECT id, username, authority, password_hash, status, name FROM users WHERE id = %s", (user_id,))
-        if result in (0, "0"):
-            return None
-        row = result[0] if result else None
-        if row:
-            return User(row[0], row[1], row[2], row[3], row[4], row[5] if len(row) > 5 else None)
-        return None
+        # Base da autorização: não usa o cache de entidades, só o identity map da requisição
+        return lookup('user', user_id, lambda: User._select_user_by_id(user_id))
+
 
     @staticmethod
     def select_user_by_id(user_id):
@@ -53,8 +54,15 @@ class User:
             user_id (int): ID do professor
 
         Returns:
-            tuple: Dados do professor ou None se não encontrado
+            User: Dados do usuário ou None se não encontrado
         """
+        user = get_loaded('user', user_id)
+        if user is not None:
+            return user
+        return cached_entity('user', user_id, lambda: User._select_user_by_id(user_id))
+
+    @staticmethod
+    def _select_user_by_id(user_id):
         query = """
             SELECT id, username, authority, password_hash, status, name FROM users WHERE id = %s
         """
@@ -63,23 +71,31 @@ class User:
             return None
         row = result[0] if result else None
         if row:
-            return User(row[0], row[1], row[2], row[3], row[4], row[5] if len(row) > 5 else None)
+            return User(*row)
         return None
 
 
 
+    LIST_COLUMNS = ('id', 'username', 'authority', 'status', 'name')
+
+    @staticmethod
+    def iter_all(batch=500):
+        """
+        Percorre todos os usuários sob demanda, sem materializar a tabela
+
+        Args:
+            batch (int): Linhas lidas do banco por vez
+
+        Yields:
+            dict: Dados do usuário (sem o hash da senha)
+        """
+        query = f"SELECT {', '.join(User.LIST_COLUMNS)} FROM users ORDER BY id ASC"
+        for row in stream_sql(query, (), batch):
+            yield dict(zip(User.LIST_COLUMNS, row))
+
     @staticmethod
     def get_all():
-        connection,cursor = connect_to_db()
-        query = "SELECT * FROM users"
-        cursor.execute(query)
-        columns = [desc[0] for desc in cursor.description]
-        result = [
-            dict(zip(columns, row)) for row in cursor.fetchall()
-        ]
-        cursor.close()
-        connection.close()
-        return result
+        return list(User.iter_all())
 
     @staticmethod
     def create_user(username, password_hash, authority="user", name=None):
@@ -91,10 +107,12 @@ class User:
     @staticmethod
     def update_password(id, password_hash):
         send_sql_command("UPDATE users set password_hash =%s where id =%s", (password_hash,id))
+        invalidate_entity('user', id)
 
     @staticmethod
     def update_authority(id,authority):
         send_sql_command("UPDATE users set authority =%s where id =%s", (authority,id))
+        invalidate_entity('user', id)
 
     @staticmethod
     def username_exists(username):
@@ -107,4 +125,5 @@ class User:
     def set_status(id, status):
         # status must be 'ativo' or 'inativo'
         send_sql_command("UPDATE users SET status = %s WHERE id = %s", (status, id))
+        invalidate_entity('user', id)
 
@@ -0,0 +1,45 @@
+import threading
+import time
+from models.project_model import Project
+
+
+def run_reconciliation():
+    """Corrige divergências entre project_status_counters e projects"""
+    drift = Project.reconcile_status_counters()
+    if drift is None:
+        print("[ERROR] Falha ao reconciliar contadores de projetos")
+    elif drift:
+        for status, (counter, expected) in drift.items():
+            print(f"[WARNING] Contador de projetos '{status}' corrigido: {counter} -> {expected}")
+    return drift
+
+
+def start_reconciliation_thread(interval):
+    """
+    Executa a reconciliação periodicamente em uma thread daemon
+
+    Args:
+        interval (int): Intervalo em segundos (0 ou None desativa)
+
+    Returns:
+        threading.Thread: Thread iniciada ou None se desativado
+    """
+    if not interval:
+        return None
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                run_reconciliation()
+            except Exception as e:
+                print(f"[ERROR] reconcile_counters: {e}")
+
+    thread = threading.Thread(target=loop, name='project-counters-reconciler', daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    drift = run_reconciliation()
+    print("Contadores conferidos." if drift == {} else f"Correções: {drift}")
@@ -19,7 +19,10 @@ migrations = [
     "016_alter_defense_minutes_student_name_nullable",
     "017_alter_defense_minutes_file_fk_set_null",
     "018_add_year_and_ata_number_defense_minutes",
-    "019_add_responsible_teacher_signature_to_courses"
+    "019_add_responsible_teacher_signature_to_courses",
+    "020_add_created_at_indexes",
+    "021_add_relation_composite_indexes",
+    "022_create_project_status_counters"
 
 ]
 
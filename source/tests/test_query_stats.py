@@ -0,0 +1,143 @@
+"""
+Testes de regressão de quantidade de comandos SQL por endpoint
+
+O banco é substituído por uma conexão falsa que responde conforme o texto
+da consulta; os comandos passam pelo mesmo TimedCursor de produção, então
+assert_max_queries e X-Query-Count contam exatamente o que seria enviado
+ao MySQL.
+"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('flask_restx')
+pytest.importorskip('MySQLdb')
+
+from flask import Flask
+from flask_restx import Api
+
+import utils.mysqlUtils as mysqlUtils
+from utils.config import Config
+from utils.identity_map import clear_identity_map
+from utils.json_provider import FastJSONProvider
+from utils.jwt_utils import encode_jwt
+from utils.query_stats import assert_max_queries, enable_query_stats, normalize_sql
+
+# Consultas fixas da listagem: usuário logado e lista de projetos
+LIST_OVERHEAD = 2
+# Por projeto: orientadores, convidados, alunos e relatórios; o curso é
+# buscado uma vez por requisição (identity map)
+QUERIES_PER_PROJECT = 4
+COURSE_LOOKUPS = 1
+
+CREATED_AT = datetime(2025, 3, 1, 12, 0, 0)
+
+
+class FakeCursor:
+    def __init__(self, database):
+        self.database = database
+        self.rows = ()
+        self.lastrowid = 0
+        self.rowcount = 0
+
+    def execute(self, sql_statement, args=None):
+        self.rows = self.database.respond(sql_statement, args)
+        self.rowcount = len(self.rows)
+
+    def executemany(self, sql_statement, args):
+        self.rows = ()
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self, *args):
+        return FakeCursor(self.database)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    """Responde às consultas da listagem de projetos com N projetos de um curso"""
+
+    def __init__(self, project_count):
+        self.project_count = project_count
+
+    def respond(self, sql_statement, args):
+        sql = normalize_sql(sql_statement)
+        if sql.startswith('SET SESSION'):
+            return ()
+        if 'FROM users WHERE id' in sql:
+            return ((1, 'admin@gradmate', 'admin', 'hash', 'ativo', 'Admin'),)
+        if 'FROM projects' in sql and 'JOIN' not in sql:
+            return tuple(
+                (project_id, f'Projeto {project_id}', None, 1, None, 'Pré-projeto', CREATED_AT, None)
+                for project_id in range(1, self.project_count + 1)
+            )
+        if 'FROM course' in sql:
+            return ((1, 'Computação', None, 'ativo', CREATED_AT, None, None, None),)
+        return ()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from api.project import project_ns
+
+    monkeypatch.setattr(Config, 'CACHE_ENABLED', False)
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.teardown_appcontext(clear_identity_map)
+    enable_query_stats(app)
+    api = Api(app)
+    api.add_namespace(project_ns, path='/project')
+    return app.test_client()
+
+
+def use_database(monkeypatch, project_count):
+    database = FakeDatabase(project_count)
+    monkeypatch.setattr(mysqlUtils, 'connect_to_db',
+                        lambda: (FakeConnection(database), FakeCursor(database)))
+
+
+def auth_headers():
+    return {'Authorization': encode_jwt({'id': 1}, Config.JWT_SECRET_KEY)}
+
+
+@pytest.mark.parametrize('project_count', [1, 10])
+def test_project_list_query_budget(client, monkeypatch, project_count):
+    use_database(monkeypatch, project_count)
+    budget = LIST_OVERHEAD + COURSE_LOOKUPS + QUERIES_PER_PROJECT * project_count
+
+    with assert_max_queries(budget) as stats:
+        response = client.get('/project/?status=all', headers=auth_headers())
+
+    assert response.status_code == 200
+    assert response.get_json()['total'] == project_count
+    assert response.get_json()['projects'][0]['course']['name'] == 'Computação'
+    assert response.headers['X-Query-Count'] == str(stats.count)
+    assert 'db;dur=' in response.headers['Server-Timing']
+
+
+def test_assert_max_queries_fails_on_regression(client, monkeypatch):
+    use_database(monkeypatch, 5)
+
+    with pytest.raises(AssertionError, match='comandos SQL executados'):
+        with assert_max_queries(LIST_OVERHEAD):
+            client.get('/project/?status=all', headers=auth_headers())
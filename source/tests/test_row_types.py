@@ -0,0 +1,37 @@
+"""
+Testes dos tipos de linha: as linhas precisam sobreviver ao pickle para
+serem gravadas no cache Redis (RedisCache serializa com pickle)
+"""
+import pickle
+from datetime import datetime
+
+import pytest
+
+from utils.row_types import row_type
+
+SampleRow = row_type('SampleRow', ('id', 'name', 'created_at'))
+
+
+def test_row_pickle_round_trip():
+    row = SampleRow(1, 'Computação', datetime(2025, 3, 1, 12, 0, 0))
+
+    restored = pickle.loads(pickle.dumps(row))
+
+    assert type(restored) is SampleRow
+    assert restored == row
+    assert restored.name == 'Computação'
+    assert restored.to_dict() == {'id': 1, 'name': 'Computação', 'created_at': datetime(2025, 3, 1, 12, 0, 0)}
+
+
+def test_model_row_pickle_round_trip():
+    pytest.importorskip('flask')
+    pytest.importorskip('MySQLdb')
+    from models.course_model import CourseRow, COURSE_COLUMNS
+
+    row = CourseRow._make(range(len(COURSE_COLUMNS)))
+
+    restored = pickle.loads(pickle.dumps(row))
+
+    assert type(restored) is CourseRow
+    assert restored == row
+    assert CourseRow.__module__ == 'models.course_model'
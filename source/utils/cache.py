@@ -0,0 +1,278 @@
+"""
+Camada de cache com TTL e invalidação por namespace
+
+O backend padrão é local ao processo (LocalCache). Com CACHE_BACKEND =
+'redis' e o pacote redis instalado, os valores e as gerações ficam em um
+Redis compartilhado entre processos (RedisCache). Qualquer outro backend
+só precisa implementar a interface de CacheBackend.
+
+A invalidação não apaga chaves: cada namespace tem um contador de geração
+que entra na chave; invalidate(namespace) incrementa o contador e as
+entradas antigas deixam de ser lidas (e expiram pelo TTL).
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from flask import g, has_app_context
+from utils.config import Config
+from utils.identity_map import evict
+
+
+class CacheBackend:
+    """Interface dos backends de cache"""
+
+    def get(self, key):
+        """Retorna o valor da chave ou None se ausente/expirado"""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        """Grava o valor com validade de ttl segundos (None = sem expiração)"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove a chave"""
+        raise NotImplementedError
+
+    def counter(self, key):
+        """Retorna o valor atual de um contador (0 se ausente)"""
+        raise NotImplementedError
+
+    def incr(self, key):
+        """Incrementa atomicamente um contador e retorna o novo valor"""
+        raise NotImplementedError
+
+
+class LocalCache(CacheBackend):
+    """
+    Cache LRU em memória do processo, com TTL e protegido por lock
+
+    Os contadores de geração ficam em um LRU próprio, também limitado a
+    max_entries (cada entidade invalidada cria um). Um contador descartado
+    volta com o maior valor já descartado (_counter_floor), nunca com um
+    valor menor que o último: assim uma entrada antiga não volta a ser lida.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._counters = OrderedDict()
+        self._counter_floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if len(self._data) >= self.max_entries and key not in self._data:
+                self._evict()
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def counter(self, key):
+        with self._lock:
+            value = self._counters.get(key)
+            if value is None:
+                return self._counter_floor
+            self._counters.move_to_end(key)
+            return value
+
+    def incr(self, key):
+        with self._lock:
+            value = self._counters.get(key, self._counter_floor) + 1
+            self._counters[key] = value
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_entries:
+                _, evicted = self._counters.popitem(last=False)
+                self._counter_floor = max(self._counter_floor, evicted)
+            return value
+
+    def _evict(self):
+        """Remove expirados; se ainda cheio, descarta a entrada menos usada"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items()
+                   if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        if len(self._data) >= self.max_entries:
+            self._data.popitem(last=False)
+
+
+class RedisCache(CacheBackend):
+    """Cache compartilhado em Redis (valores serializados com pickle)"""
+
+    def __init__(self, url, prefix='gradmate:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl or None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def counter(self, key):
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+
+_backends = {}
+_backend_lock = threading.Lock()
+
+
+def _create_backend(max_entries, prefix):
+    if Config.CACHE_BACKEND == 'redis' and Config.CACHE_REDIS_URL:
+        try:
+            return RedisCache(Config.CACHE_REDIS_URL, prefix)
+        except ImportError as e:
+            print(f"[WARNING] Cache Redis indisponível, usando cache local: {e}")
+    return LocalCache(max_entries)
+
+
+def get_backend(name='default'):
+    """
+    Retorna o backend configurado (criado no primeiro uso)
+
+    'default' guarda estatísticas e agregados; 'entity' guarda linhas por
+    id, em um LRU separado para não disputar espaço com os agregados. Se o
+    Redis estiver configurado mas indisponível, usa o cache local.
+
+    Args:
+        name (str): 'default' ou 'entity'
+    """
+    backend = _backends.get(name)
+    if backend is None:
+        with _backend_lock:
+            backend = _backends.get(name)
+            if backend is None:
+                if name == 'entity':
+                    backend = _create_backend(Config.ENTITY_CACHE_MAX_ENTRIES, 'gradmate:entity:')
+                else:
+                    backend = _create_backend(Config.CACHE_MAX_ENTRIES, 'gradmate:')
+                _backends[name] = backend
+    return backend
+
+
+def cached(namespace, key, loader, ttl=None, backend_name='default'):
+    """
+    Leitura com cache: retorna o valor em cache ou chama loader e grava
+
+    Falhas do backend não derrubam a requisição: o loader é chamado direto.
+    Resultados None não são gravados.
+
+    Args:
+        namespace (str): Namespace de invalidação (ex.: 'project_stats')
+        key (str): Chave dentro do namespace
+        loader (callable): Função sem argumentos que calcula o valor
+        ttl (int, optional): Validade em segundos (padrão: CACHE_DEFAULT_TTL)
+        backend_name (str): Backend usado (ver get_backend)
+
+    Returns:
+        Valor em cache ou calculado
+    """
+    if not Config.CACHE_ENABLED:
+        return loader()
+    try:
+        backend = get_backend(backend_name)
+        full_key = f"{namespace}:{backend.counter('gen:' + namespace)}:{key}"
+        value = backend.get(full_key)
+        if value is not None:
+            return value
+    except Exception as e:
+        print(f"[ERROR] cache get {namespace}:{key}: {e}")
+        return loader()
+
+    value = loader()
+    if value is not None:
+        try:
+            backend.set(full_key, value, ttl if ttl is not None else Config.CACHE_DEFAULT_TTL)
+        except Exception as e:
+            print(f"[ERROR] cache set {namespace}:{key}: {e}")
+    return value
+
+
+def invalidate(*namespaces, backend_name='default'):
+    """
+    Invalida todas as entradas dos namespaces informados
+
+    Args:
+        *namespaces (str): Namespaces a invalidar
+        backend_name (str): Backend usado (ver get_backend)
+    """
+    try:
+        backend = get_backend(backend_name)
+        for namespace in namespaces:
+            backend.incr(f"gen:{namespace}")
+    except Exception as e:
+        print(f"[ERROR] cache invalidate {namespaces}: {e}")
+
+
+def cached_entity(entity, entity_id, loader):
+    """
+    Leitura com cache de uma linha por id (LRU + TTL)
+
+    Cada (entidade, id) tem sua própria versão, então uma escrita invalida
+    só aquele registro. Depois de bypass_entity_cache() a requisição atual
+    lê direto do banco.
+
+    Args:
+        entity (str): Nome da entidade (ex.: 'course')
+        entity_id (int): ID do registro
+        loader (callable): Função sem argumentos que busca o registro
+
+    Returns:
+        Registro em cache ou retornado pelo loader
+    """
+    if entity_id is None or (has_app_context() and g.get('_bypass_entity_cache')):
+        return loader()
+    return cached(f"{entity}:{entity_id}", 'row', loader, Config.ENTITY_CACHE_TTL, backend_name='entity')
+
+
+def bypass_entity_cache():
+    """
+    Faz as leituras por id da requisição atual ignorarem o cache de entidades
+
+    Usado nos GETs de detalhe com ETag: a versão vem do banco, então o corpo
+    (inclusive registros embutidos, como curso e usuário) também precisa vir,
+    senão outro processo com cache antigo responderia dados velhos sob o
+    ETag novo. invalidate_entity só limpa o processo atual.
+    """
+    if has_app_context():
+        g._bypass_entity_cache = True
+
+
+def invalidate_entity(entity, *entity_ids):
+    """
+    Invalida os registros informados de uma entidade
+
+    Também remove os registros do identity map da requisição atual.
+
+    Args:
+        entity (str): Nome da entidade
+        *entity_ids (int): IDs dos registros alterados
+    """
+    evict(entity, *entity_ids)
+    invalidate(*(f"{entity}:{entity_id}" for entity_id in entity_ids if entity_id is not None),
+               backend_name='entity')
@@ -6,6 +6,42 @@ class Config:
     MYSQL_PORT = 3306
     MYSQL_DB = 'gradmate'
     JWT_SECRET_KEY = 'senhajwt'
+    # Assina os tokens dos feeds de calendário (?token=); separado do JWT de login
+    CALENDAR_FEED_SECRET_KEY = 'senhafeed'
     # Uploads
     UPLOAD_FOLDER = 'uploads'  # base folder (relative to project root). Files will be stored under uploads/projects/<project_id>
-    MAX_CONTENT_LENGTH = 64 * 1024 * 1024  # 64MB per request (adjust as needed)
\ No newline at end of file
+    MAX_CONTENT_LENGTH = 64 * 1024 * 1024  # 64MB per request (adjust as needed)
+    # Calendário: validade (segundos) do cache de status por ano em memória
+    CALENDAR_CACHE_TTL = 300
+    # Compressão de respostas (gzip; brotli se o pacote estiver instalado)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024  # bytes; respostas menores vão sem compressão
+    COMPRESSION_LEVEL = 6
+    COMPRESSION_BROTLI_QUALITY = 4
+    # Streaming: envia um bloco comprimido a cada N bytes de entrada ou após o intervalo (s)
+    COMPRESSION_STREAM_FLUSH_SIZE = 16 * 1024
+    COMPRESSION_STREAM_FLUSH_INTERVAL = 1.0
+    # CORS: origens permitidas ('*' libera todas) e cache do preflight no navegador
+    CORS_ALLOWED_ORIGINS = ['*']
+    CORS_MAX_AGE = 7200  # segundos (Chrome limita a 7200)
+    # Cache de leituras (estatísticas etc.): 'local' (por processo) ou 'redis'
+    CACHE_ENABLED = True
+    CACHE_BACKEND = 'local'
+    CACHE_REDIS_URL = None  # ex.: 'redis://localhost:6379/0'
+    CACHE_DEFAULT_TTL = 60
+    CACHE_MAX_ENTRIES = 1024
+    STATISTICS_CACHE_TTL = 300
+    # Cache de registros por id (cursos, professores, usuários exibidos)
+    ENTITY_CACHE_TTL = 120
+    ENTITY_CACHE_MAX_ENTRIES = 4096
+    # Reconciliação periódica de project_status_counters (segundos; 0 desativa)
+    PROJECT_COUNTERS_RECONCILE_INTERVAL = 3600
+    # Contagem de SQL por requisição (X-Query-Count / Server-Timing)
+    QUERY_STATS_ENABLED = True
+    N_PLUS_ONE_THRESHOLD = 10  # repetições do mesmo comando antes do [WARNING]
+    # Métricas no formato Prometheus em GET /metrics
+    METRICS_ENABLED = True
+    # Log de consultas lentas (GET /admin/slow-queries); 0 desativa
+    SLOW_QUERY_THRESHOLD_MS = 500
+    SLOW_QUERY_MAX_SAMPLES = 200
+    SLOW_QUERY_EXPLAIN = False  # EXPLAIN FORMAT=JSON na primeira ocorrência de cada SELECT
@@ -0,0 +1,58 @@
+"""
+Helpers para ETag fraco e GET condicional (If-None-Match)
+
+O ETag é calculado a partir de uma consulta barata de versão (max de
+updated_at, contagens e checksums dos vínculos) e comparado antes de
+montar o corpo da resposta.
+"""
+import hashlib
+from flask import request, make_response
+
+
+def make_etag(kind, resource_id, version):
+    """
+    Gera o valor do ETag de um recurso
+
+    Args:
+        kind (str): Tipo do recurso (ex.: 'project')
+        resource_id (int): ID do recurso
+        version (tuple): Resultado da consulta de versão
+
+    Returns:
+        str: Valor do ETag (sem aspas)
+    """
+    raw = f"{kind}:{resource_id}:" + "|".join(str(part) for part in version)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def not_modified_response(etag):
+    """
+    Retorna um 304 se o cliente já tem a versão atual do recurso
+
+    Args:
+        etag (str): ETag atual do recurso
+
+    Returns:
+        Response: Resposta 304 ou None se o corpo precisa ser enviado
+    """
+    if etag and request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        return with_etag(response, etag)
+    return None
+
+
+def with_etag(response, etag):
+    """
+    Anexa o ETag fraco à resposta e exige revalidação a cada uso
+
+    Args:
+        response (Response): Resposta Flask
+        etag (str): ETag do recurso
+
+    Returns:
+        Response: A mesma resposta
+    """
+    if etag:
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
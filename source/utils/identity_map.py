@@ -0,0 +1,88 @@
+"""
+Identity map por requisição para buscas de registros por chave
+
+Guarda em flask.g os registros já carregados durante a requisição,
+indexados por (tabela, chave). Uma segunda busca do mesmo registro na
+mesma requisição não vai ao banco. O mapa é descartado no teardown, então
+não há risco de dado velho entre requisições.
+"""
+from flask import g, has_app_context
+
+_MISSING = object()
+
+
+def _get_map(create=False):
+    if not has_app_context():
+        return None
+    identity_map = g.get('_identity_map')
+    if identity_map is None and create:
+        identity_map = g._identity_map = {}
+    return identity_map
+
+
+def lookup(table, key, loader):
+    """
+    Retorna o registro já carregado na requisição ou chama loader
+
+    Fora de um contexto Flask (scripts, migrações) apenas chama loader.
+    Resultados None não são guardados.
+
+    Args:
+        table (str): Nome da tabela/entidade (ex.: 'user')
+        key: Chave do registro (normalmente o id)
+        loader (callable): Função sem argumentos que busca o registro
+
+    Returns:
+        Registro carregado ou None
+    """
+    identity_map = _get_map(create=True)
+    if identity_map is None or key is None:
+        return loader()
+    value = identity_map.get((table, key), _MISSING)
+    if value is _MISSING:
+        value = loader()
+        if value is not None:
+            identity_map[(table, key)] = value
+    return value
+
+
+def get_loaded(table, key):
+    """
+    Retorna o registro se já foi carregado na requisição, sem ir ao banco
+
+    Args:
+        table (str): Nome da tabela/entidade
+        key: Chave do registro
+
+    Returns:
+        Registro carregado ou None
+    """
+    identity_map = _get_map()
+    if not identity_map:
+        return None
+    return identity_map.get((table, key))
+
+
+def evict(table, *keys):
+    """
+    Remove registros do mapa após uma escrita
+
+    Args:
+        table (str): Nome da tabela/entidade
+        *keys: Chaves a remover; sem chaves remove toda a tabela
+    """
+    identity_map = _get_map()
+    if not identity_map:
+        return
+    if keys:
+        for key in keys:
+            identity_map.pop((table, key), None)
+    else:
+        for cached_key in [k for k in identity_map if k[0] == table]:
+            del identity_map[cached_key]
+
+
+def clear_identity_map(exception=None):
+    """Descarta o mapa da requisição (registrado como teardown_appcontext)"""
+    if has_app_context():
+        g.pop('_identity_map', None)
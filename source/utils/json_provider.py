@@ -0,0 +1,74 @@
+"""
+Provider de JSON da aplicação Flask
+
+Usa orjson quando o pacote está instalado e cai para o json da stdlib
+caso contrário. Nos dois casos datetime/date saem em ISO 8601, Decimal
+como string e linhas tipadas (namedtuples de row_types) como arrays,
+então as respostas são iguais independente do backend. Os formatters
+devolvem datetimes sem formatar; o formato é definido só aqui.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def default_serializer(obj):
+    """
+    Converte tipos não suportados nativamente pelo encoder
+
+    Args:
+        obj: Valor a serializar
+
+    Returns:
+        Valor serializável em JSON
+
+    Raises:
+        TypeError: Se o tipo não for suportado
+    """
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, tuple):
+        # orjson só serializa tuple exata; namedtuples chegam aqui e saem
+        # como array, igual ao json da stdlib
+        return list(obj)
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider com backend orjson opcional
+
+    Segue as opções do DefaultJSONProvider (sort_keys e indent em modo
+    debug); com orjson, chaves não-string de dicionários também são
+    aceitas (OPT_NON_STR_KEYS), como no json da stdlib.
+    """
+
+    backend = 'orjson' if orjson else 'json'
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            kwargs.setdefault('default', default_serializer)
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default_serializer, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
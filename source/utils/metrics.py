@@ -0,0 +1,221 @@
+"""
+Métricas em memória no formato texto do Prometheus (GET /metrics)
+
+A agregação é feita no próprio processo: contadores e histogramas são
+dicionários indexados pelos valores dos labels, protegidos por um único
+lock. Com vários processos (ex.: gunicorn com workers), cada um expõe os
+seus números e o Prometheus soma pelas instâncias.
+
+GET /metrics não exige autenticação, então nenhum label carrega texto de
+SQL: comandos aparecem só pelo fingerprint (o log de consultas lentas,
+restrito a administradores, mostra o comando de cada fingerprint).
+"""
+import hashlib
+import threading
+import time
+from bisect import bisect_left
+from flask import request, Response
+from utils.config import Config
+
+_lock = threading.Lock()
+_registry = []
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+CONNECT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        _registry.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            items = list(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Contador monotônico"""
+    kind = 'counter'
+
+    def inc(self, *label_values, amount=1):
+        with _lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(_Metric):
+    """Valor que sobe e desce"""
+    kind = 'gauge'
+
+    def inc(self, *label_values, amount=1):
+        with _lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Histograma com buckets fixos (contagem por bucket, soma e total)"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=REQUEST_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            items = [(labels, (list(state[0]), state[1], state[2])) for labels, state in self._values.items()]
+        bounds = self.buckets + (float('inf'),)
+        for label_values, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, label_values, (('le', _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+http_requests_total = Counter(
+    'http_requests_total', 'Requisições HTTP por rota e status', ('method', 'route', 'status'))
+http_request_duration_seconds = Histogram(
+    'http_request_duration_seconds', 'Latência das requisições HTTP', ('method', 'route'), REQUEST_BUCKETS)
+http_request_bytes_total = Counter(
+    'http_request_bytes_total', 'Bytes recebidos no corpo das requisições (upload)', ('method', 'route'))
+http_response_bytes_total = Counter(
+    'http_response_bytes_total', 'Bytes enviados no corpo das respostas (download)', ('method', 'route'))
+db_query_duration_seconds = Histogram(
+    'db_query_duration_seconds', 'Latência dos comandos SQL por fingerprint',
+    ('fingerprint',), SQL_BUCKETS)
+db_connections_opened_total = Counter(
+    'db_connections_opened_total', 'Conexões MySQL abertas')
+db_connections_closed_total = Counter(
+    'db_connections_closed_total', 'Conexões MySQL fechadas')
+db_connections_in_use = Gauge(
+    'db_connections_in_use', 'Conexões MySQL abertas no momento')
+db_connect_duration_seconds = Histogram(
+    'db_connect_duration_seconds', 'Tempo para abrir uma conexão MySQL', (), CONNECT_BUCKETS)
+
+
+def sql_fingerprint(normalized_sql):
+    """Retorna um identificador curto e estável de um comando normalizado"""
+    return hashlib.sha1(normalized_sql.encode('utf-8')).hexdigest()[:12]
+
+
+def observe_sql(normalized_sql, duration):
+    """Registra a latência de um comando SQL já normalizado"""
+    if Config.METRICS_ENABLED:
+        db_query_duration_seconds.observe(duration, sql_fingerprint(normalized_sql))
+
+
+def connection_opened(duration):
+    """Registra a abertura de uma conexão e o tempo gasto para abri-la"""
+    db_connections_opened_total.inc()
+    db_connections_in_use.inc()
+    db_connect_duration_seconds.observe(duration)
+
+
+def connection_closed():
+    db_connections_closed_total.inc()
+    db_connections_in_use.dec()
+
+
+def render_metrics():
+    """
+    Monta o texto de todas as métricas registradas
+
+    Returns:
+        str: Métricas no formato de exposição do Prometheus
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _count_stream(chunks, labels):
+    """Conta os bytes de uma resposta em streaming à medida que são enviados"""
+    try:
+        for chunk in chunks:
+            http_response_bytes_total.inc(*labels, amount=len(chunk))
+            yield chunk
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+
+def enable_metrics(app):
+    """
+    Registra a coleta por requisição e a rota GET /metrics
+
+    Deve ser chamado antes de enable_cors/enable_compression: os
+    after_request rodam em ordem inversa, então o tamanho medido é o do
+    corpo já comprimido.
+    """
+    @app.before_request
+    def start_request_timer():
+        request.environ['metrics.start'] = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = request.environ.get('metrics.start')
+        if start is None or not Config.METRICS_ENABLED:
+            return response
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        labels = (request.method, route)
+        http_requests_total.inc(request.method, route, str(response.status_code))
+        http_request_duration_seconds.observe(time.perf_counter() - start, *labels)
+        if request.content_length:
+            http_request_bytes_total.inc(*labels, amount=request.content_length)
+        if response.content_length is not None:
+            http_response_bytes_total.inc(*labels, amount=response.content_length)
+        elif response.is_streamed and not response.direct_passthrough:
+            response.response = _count_stream(response.response, labels)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        if not Config.METRICS_ENABLED:
+            return Response('metrics disabled\n', status=404, mimetype='text/plain')
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
@@ -1,5 +1,24 @@
 from MySQLdb import connections as sqlconnector
+from MySQLdb.cursors import SSCursor
 from utils.config import Config
+from contextlib import contextmanager
+from itertools import islice
+from utils.query_stats import TimedCursor
+from utils.metrics import connection_opened, connection_closed
+import time
+
+
+class TrackedConnection(sqlconnector.Connection):
+    """Conexão que informa abertura/fechamento às métricas (db_connections_*)"""
+
+    _tracked_closed = False
+
+    def close(self):
+        if not self._tracked_closed:
+            self._tracked_closed = True
+            connection_closed()
+        super().close()
+
 
 def initialize_database():
     try:
@@ -20,13 +39,15 @@ def initialize_database():
 
 def connect_to_db() -> object:
     try:
-        connection = sqlconnector.Connection(
+        start = time.perf_counter()
+        connection = TrackedConnection(
             host=Config.MYSQL_HOST,
             user=Config.MYSQL_USER,
             password=Config.MYSQL_PASSWORD,
             database=Config.MYSQL_DB,
             port=Config.MYSQL_PORT
         )
+        connection_opened(time.perf_counter() - start)
         cursor = connection.cursor()
         return connection, cursor
     except sqlconnector.Error as e:
@@ -57,7 +78,7 @@ def send_sql_command(sql_statement, args=None):
         cursor.execute("SET SESSION tmp_table_size = 67108864")
         cursor.execute("SET SESSION max_heap_table_size = 67108864")
 
-        cursor.execute(sql_statement, args)
+        TimedCursor(cursor).execute(sql_statement, args)
         result = cursor.fetchall()
         last_id = int(cursor.lastrowid)
         return last_id if result == () else result
@@ -71,3 +92,142 @@ def send_sql_command(sql_statement, args=None):
         if connection:
             connection.commit()
             connection.close()
+
+
+def stream_sql(sql_statement, args=None, batch=500):
+    """
+    Executa uma consulta e entrega as linhas sob demanda (cursor server-side)
+
+    Diferente de send_sql_command, o resultado não é materializado com
+    fetchall(): as linhas são lidas do MySQL em blocos de 'batch'. A conexão
+    fica ocupada até o gerador terminar ou ser fechado, então não execute
+    outros comandos nela enquanto itera.
+
+    Args:
+        sql_statement (str): Consulta SELECT
+        args (tuple, optional): Parâmetros da consulta
+        batch (int): Linhas lidas do servidor por vez
+
+    Yields:
+        tuple: Uma linha do resultado
+    """
+    connection, _ = connect_to_db()
+    cursor = TimedCursor(connection.cursor(SSCursor))
+    exhausted = False
+    try:
+        cursor.execute(sql_statement, args)
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                break
+            yield from rows
+        exhausted = True
+    finally:
+        # Fechar o cursor de um resultado não lido faria o driver ler o
+        # restante; fechando só a conexão o servidor descarta o resultado
+        if exhausted:
+            cursor.close()
+        connection.close()
+
+
+def iter_chunks(iterable, size):
+    """
+    Agrupa um iterável em listas de até 'size' itens
+
+    Args:
+        iterable (iterable): Origem dos itens (ex.: stream_sql)
+        size (int): Tamanho de cada bloco
+
+    Yields:
+        list: Bloco de itens
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            break
+        yield chunk
+
+
+@contextmanager
+def transaction():
+    """
+    Abre uma conexão com transação explícita
+
+    Faz commit ao final do bloco ou rollback (e relança) em caso de exceção.
+
+    Yields:
+        tuple: (connection, cursor)
+    """
+    connection, cursor = connect_to_db()
+    try:
+        yield connection, TimedCursor(cursor)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def send_bulk_command(sql_statement, rows, chunk_size=500, cursor=None):
+    """
+    Executa um comando em lote com cursor.executemany
+
+    Para 'INSERT ... VALUES (%s, ...)' (inclusive com ON DUPLICATE KEY
+    UPDATE) o MySQLdb reescreve cada chunk em um único INSERT multi-linhas.
+    Sem cursor, todos os chunks rodam em uma transação própria; com cursor
+    (ex.: vindo de transaction()), o commit fica a cargo de quem chamou.
+
+    first_id/last_id só são confiáveis para INSERT simples (sem IGNORE ou
+    ON DUPLICATE KEY), onde cada chunk gera ids consecutivos.
+
+    Args:
+        sql_statement (str): Comando com placeholders de uma linha
+        rows (iterable): Tuplas de parâmetros, uma por linha
+        chunk_size (int): Linhas por comando enviado ao banco
+        cursor (optional): Cursor de uma transação já aberta
+
+    Returns:
+        dict: {'affected': int, 'first_id': int ou None, 'last_id': int ou None},
+              ou None em caso de erro (quando a transação é própria)
+    """
+    result = {'affected': 0, 'first_id': None, 'last_id': None}
+    own_transaction = cursor is None
+    connection = None
+    try:
+        if own_transaction:
+            connection, cursor = connect_to_db()
+            cursor = TimedCursor(cursor)
+
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            cursor.executemany(sql_statement, chunk)
+            result['affected'] += max(cursor.rowcount, 0)
+            first_id = int(cursor.lastrowid or 0)
+            if first_id:
+                if result['first_id'] is None:
+                    result['first_id'] = first_id
+                result['last_id'] = first_id + len(chunk) - 1
+
+        if own_transaction:
+            connection.commit()
+        return result
+
+    except Exception as e:
+        print(f"[ERROR] send_bulk_command: {e}")
+        if not own_transaction:
+            raise
+        if connection:
+            connection.rollback()
+        return None
+    finally:
+        if own_transaction:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
@@ -0,0 +1,31 @@
+"""
+Helpers para geração de hashes de senha em lote
+"""
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash
+import os
+
+DEFAULT_PASSWORD = "fatec"
+
+
+def hash_passwords(passwords, max_workers=None):
+    """
+    Gera os hashes PBKDF2 de várias senhas em paralelo
+
+    O hashlib libera o GIL durante o PBKDF2, então threads usam vários
+    núcleos. Cada hash continua com salt próprio.
+
+    Args:
+        passwords (list): Senhas em texto puro
+        max_workers (int, optional): Número de threads (padrão: núcleos da CPU)
+
+    Returns:
+        list: Hashes na mesma ordem das senhas
+    """
+    if not passwords:
+        return []
+    workers = max_workers or min(len(passwords), os.cpu_count() or 1)
+    if workers <= 1:
+        return [generate_password_hash(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(generate_password_hash, passwords))
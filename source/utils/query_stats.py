@@ -0,0 +1,216 @@
+"""
+Contagem de comandos SQL por requisição e detecção de N+1
+
+Cada comando executado por mysqlUtils é registrado no coletor ativo
+(guardado em um ContextVar): quantidade, tempo total e um histograma por
+comando normalizado (literais e placeholders trocados por '?'). A resposta
+recebe X-Query-Count e Server-Timing, e um comando repetido mais de
+N_PLUS_ONE_THRESHOLD vezes gera um [WARNING].
+
+Em respostas com streaming (stream_with_context: /auth/users, feed .ics,
+exportações) os cabeçalhos são enviados antes do corpo, então só contam os
+comandos executados até ali. A verificação de N+1 roda no teardown, depois
+do corpo, e inclui também os comandos do streaming.
+"""
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from flask import request
+from utils.config import Config
+from utils.metrics import observe_sql
+from utils.slow_query_log import record_slow_query
+
+_current = ContextVar('query_stats', default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql_statement):
+    """
+    Normaliza um comando SQL para agrupar execuções equivalentes
+
+    Literais, números e placeholders viram '?', listas de IN viram '(?+)'
+    e os espaços são compactados.
+
+    Args:
+        sql_statement (str): Comando SQL
+
+    Returns:
+        str: Comando normalizado
+    """
+    sql = _STRING_LITERAL.sub('?', sql_statement)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(?+)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryStats:
+    """
+    Estatísticas de SQL acumuladas em uma requisição (ou bloco de teste)
+
+    Coletores aninhados repassam os registros ao coletor de fora, então um
+    assert_max_queries em volta de uma chamada do test client também conta
+    os comandos da requisição.
+    """
+
+    __slots__ = ('count', 'total_time', 'statements', 'statement_time', 'started_at', 'parent')
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.count = 0
+        self.total_time = 0.0
+        self.statements = Counter()
+        self.statement_time = defaultdict(float)
+        self.started_at = time.perf_counter()
+
+    def record(self, fingerprint, duration):
+        self.count += 1
+        self.total_time += duration
+        self.statements[fingerprint] += 1
+        self.statement_time[fingerprint] += duration
+        if self.parent is not None:
+            self.parent.record(fingerprint, duration)
+
+    def repeated(self, threshold):
+        """Retorna [(comando, vezes)] dos comandos repetidos mais de threshold vezes"""
+        return [(sql, count) for sql, count in self.statements.most_common() if count > threshold]
+
+
+def observe(sql_statement, duration, args=None):
+    """
+    Registra a execução de um comando no coletor ativo (se houver), nas
+    métricas de latência por fingerprint e no log de consultas lentas
+
+    Args:
+        sql_statement (str): Comando executado
+        duration (float): Duração em segundos
+        args (tuple, optional): Parâmetros do comando
+    """
+    stats = _current.get()
+    if stats is None and not Config.METRICS_ENABLED and not Config.SLOW_QUERY_THRESHOLD_MS:
+        return
+    fingerprint = normalize_sql(sql_statement)
+    observe_sql(fingerprint, duration)
+    record_slow_query(sql_statement, fingerprint, args, duration)
+    if stats is not None:
+        stats.record(fingerprint, duration)
+
+
+class TimedCursor:
+    """Envolve um cursor MySQLdb registrando execute/executemany"""
+
+    __slots__ = ('_cursor',)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql_statement, args=None):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(sql_statement, args)
+        finally:
+            observe(sql_statement, time.perf_counter() - start, args)
+
+    def executemany(self, sql_statement, args):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql_statement, args)
+        finally:
+            observe(sql_statement, time.perf_counter() - start, args)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+def start_collecting():
+    """
+    Ativa um novo coletor no contexto atual
+
+    Returns:
+        tuple: (QueryStats, token para stop_collecting)
+    """
+    stats = QueryStats(_current.get())
+    return stats, _current.set(stats)
+
+
+def stop_collecting(token):
+    """Restaura o coletor anterior"""
+    _current.reset(token)
+
+
+def current_stats():
+    """Retorna o coletor ativo ou None"""
+    return _current.get()
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """
+    Falha se o bloco executar mais de 'limit' comandos SQL
+
+    Uso em testes:
+        with assert_max_queries(5):
+            client.get('/project/1')
+
+    Args:
+        limit (int): Quantidade máxima de comandos
+
+    Yields:
+        QueryStats: Estatísticas do bloco
+
+    Raises:
+        AssertionError: Se o limite for ultrapassado
+    """
+    stats, token = start_collecting()
+    try:
+        yield stats
+    finally:
+        stop_collecting(token)
+    if stats.count > limit:
+        top = '\n'.join(f"  {count}x {sql}" for sql, count in stats.statements.most_common(5))
+        raise AssertionError(f"{stats.count} comandos SQL executados (máximo {limit}):\n{top}")
+
+
+def enable_query_stats(app):
+    @app.before_request
+    def start_query_stats():
+        if Config.QUERY_STATS_ENABLED:
+            request.environ['query_stats.token'] = start_collecting()[1]
+
+    @app.after_request
+    def add_query_stats_headers(response):
+        stats = _current.get()
+        if stats is None or 'query_stats.token' not in request.environ:
+            return response
+        db_ms = stats.total_time * 1000
+        app_ms = (time.perf_counter() - stats.started_at) * 1000
+        response.headers['X-Query-Count'] = str(stats.count)
+        response.headers['Server-Timing'] = (
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={app_ms:.1f}'
+        )
+        return response
+
+    @app.teardown_request
+    def stop_query_stats(exception=None):
+        token = request.environ.pop('query_stats.token', None)
+        if token is None:
+            return
+        stats = _current.get()
+        try:
+            for sql, count in stats.repeated(Config.N_PLUS_ONE_THRESHOLD):
+                print(f"[WARNING] Possível N+1 em {request.method} {request.path}: "
+                      f"{count}x {sql[:200]}")
+        finally:
+            stop_collecting(token)
@@ -1,5 +1,6 @@
 from flask import request
 import json
+from datetime import datetime
 
 
 def get_json_data():
@@ -14,3 +15,87 @@ def get_json_data():
         except Exception:
             return {}
     return data if isinstance(data, dict) else {}
+
+
+def normalize_ids(ids):
+    """
+    Converte uma lista de ids para inteiros únicos, preservando a ordem
+
+    Args:
+        ids (list): Ids recebidos no payload
+
+    Returns:
+        tuple: (lista de ids válidos, lista de valores inválidos)
+    """
+    valid = []
+    invalid = []
+    seen = set()
+    for value in ids:
+        try:
+            item = int(value)
+        except (TypeError, ValueError):
+            invalid.append(value)
+            continue
+        if item not in seen:
+            seen.add(item)
+            valid.append(item)
+    return valid, invalid
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def get_keyset_page_args(data):
+    """
+    Extrai os parâmetros de paginação keyset (limit e cursor) do payload
+
+    O cursor é o par {'created_at': ISO-8601, 'id': int} devolvido em
+    next_cursor pela página anterior.
+
+    Args:
+        data (dict): Payload da requisição
+
+    Returns:
+        tuple: (limit, after) ou (None, None) se não houver paginação
+
+    Raises:
+        ValueError: Se limit ou cursor forem inválidos
+    """
+    limit = data.get('limit')
+    cursor = data.get('cursor')
+    if limit is None and cursor is None:
+        return None, None
+
+    limit = int(limit) if limit is not None else DEFAULT_PAGE_SIZE
+    if limit < 1:
+        raise ValueError("limit deve ser maior que zero")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    after = None
+    if cursor:
+        if not isinstance(cursor, dict) or 'created_at' not in cursor or 'id' not in cursor:
+            raise ValueError("cursor deve conter created_at e id")
+        after = (datetime.fromisoformat(str(cursor['created_at'])), int(cursor['id']))
+    return limit, after
+
+
+def build_next_cursor(rows, limit, created_at_index):
+    """
+    Monta o cursor da próxima página a partir da última linha retornada
+
+    Args:
+        rows (list): Linhas da página atual (id na posição 0)
+        limit (int): Tamanho da página solicitada
+        created_at_index (int): Posição de created_at na tupla
+
+    Returns:
+        dict: Cursor para a próxima página ou None se não houver mais dados
+    """
+    if limit is None or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return {
+        'created_at': last[created_at_index].isoformat(),
+        'id': last[0]
+    }
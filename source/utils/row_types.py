@@ -0,0 +1,79 @@
+"""
+Tipos de linha compactos para resultados de consultas
+
+Cada tipo é uma namedtuple com __slots__ vazio: não há __dict__ por
+instância, o acesso é por atributo (row.created_at) e a indexação
+posicional (row[7]) continua funcionando para o código existente.
+
+O tipo deve ser atribuído a uma variável de módulo com o mesmo nome
+(CourseRow = row_type('CourseRow', ...)): o pickle localiza a classe por
+módulo + nome, e é assim que as linhas vão para o cache Redis.
+"""
+import sys
+from collections import namedtuple
+
+
+def row_type(name, columns, module=None):
+    """
+    Cria um tipo de linha a partir da lista de colunas da consulta
+
+    Args:
+        name (str): Nome do tipo (igual ao da variável que o recebe)
+        columns (tuple): Nomes das colunas, na ordem do SELECT
+        module (str, optional): Módulo onde o tipo é definido (padrão: o
+            módulo que chamou row_type)
+
+    Returns:
+        type: Subclasse de namedtuple com to_dict()
+    """
+    if module is None:
+        module = sys._getframe(1).f_globals.get('__name__', '__main__')
+    base = namedtuple(name, columns, module=module)
+    fields = base._fields
+
+    def to_dict(self):
+        """Converte a linha em dicionário {coluna: valor}"""
+        return dict(zip(fields, self))
+
+    return type(name, (base,), {
+        '__slots__': (),
+        '__module__': module,
+        '__qualname__': name,
+        'to_dict': to_dict,
+    })
+
+
+def wrap(row_cls, result):
+    """
+    Converte o resultado de send_sql_command em linhas tipadas
+
+    Valores que não são listas de linhas (0 sem resultado, "0" em erro,
+    None) são devolvidos sem alteração para manter as verificações atuais.
+
+    Args:
+        row_cls (type): Tipo criado por row_type
+        result: Retorno de send_sql_command
+
+    Returns:
+        list: Linhas tipadas, ou o próprio result se não houver linhas
+    """
+    if not isinstance(result, (list, tuple)):
+        return result
+    make = row_cls._make
+    return [make(row) for row in result]
+
+
+def wrap_one(row_cls, result):
+    """
+    Retorna a primeira linha tipada do resultado ou None
+
+    Args:
+        row_cls (type): Tipo criado por row_type
+        result: Retorno de send_sql_command
+
+    Returns:
+        namedtuple: Primeira linha ou None se não houver linhas (ou em erro)
+    """
+    if not isinstance(result, (list, tuple)) or not result:
+        return None
+    return row_cls._make(result[0])
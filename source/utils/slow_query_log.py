@@ -0,0 +1,162 @@
+"""
+Log de consultas lentas com captura opcional de EXPLAIN
+
+Comandos acima de SLOW_QUERY_THRESHOLD_MS geram um [WARNING] com o
+comando normalizado, os parâmetros mascarados, a duração e o endpoint. As
+últimas SLOW_QUERY_MAX_SAMPLES ocorrências ficam em um buffer circular
+consultado em GET /admin/slow-queries. Com SLOW_QUERY_EXPLAIN ligado, a
+primeira ocorrência de cada SELECT roda EXPLAIN FORMAT=JSON em uma
+conexão separada, em uma thread de fundo (a requisição lenta não espera),
+e o plano fica guardado junto do fingerprint.
+"""
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import has_request_context, request
+from utils.config import Config
+from utils.metrics import sql_fingerprint
+
+_lock = threading.Lock()
+_samples = deque(maxlen=Config.SLOW_QUERY_MAX_SAMPLES)
+_explains = {}
+# Uma única thread: EXPLAINs são raros (um por fingerprint) e não devem
+# competir com as requisições por conexões
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slow-query-explain')
+
+
+def redact_params(args):
+    """
+    Mascara os parâmetros de um comando para o log
+
+    Números, booleanos e None são mantidos (ids, limites); textos e bytes
+    viram apenas tipo e tamanho, para não registrar e-mails, senhas ou
+    hashes.
+
+    Args:
+        args (tuple | dict | None): Parâmetros do comando
+
+    Returns:
+        list | dict | None: Parâmetros mascarados
+    """
+    def redact(value):
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, (str, bytes)):
+            return f"<{type(value).__name__} len={len(value)}>"
+        return f"<{type(value).__name__}>"
+
+    if args is None:
+        return None
+    if isinstance(args, dict):
+        return {key: redact(value) for key, value in args.items()}
+    if isinstance(args, (list, tuple)):
+        # executemany: só o tamanho do lote
+        if args and isinstance(args[0], (list, tuple, dict)):
+            return f"<{len(args)} linhas>"
+        return [redact(value) for value in args]
+    return redact(args)
+
+
+def _current_endpoint():
+    if not has_request_context():
+        return None
+    route = request.url_rule.rule if request.url_rule else request.path
+    return f"{request.method} {route}"
+
+
+def _is_explainable(sql_statement):
+    return sql_statement.lstrip().lstrip('(').upper().startswith(('SELECT', 'WITH'))
+
+
+def _explain(sql_statement, args):
+    """Roda EXPLAIN FORMAT=JSON em uma conexão própria (fora das métricas de SQL)"""
+    from utils.mysqlUtils import connect_to_db
+
+    connection, cursor = connect_to_db()
+    try:
+        cursor.execute("EXPLAIN FORMAT=JSON " + sql_statement, args)
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _capture_explain(fingerprint, sql_statement, args):
+    """Executado na thread de fundo: guarda o plano (ou o erro) do fingerprint"""
+    try:
+        plan = _explain(sql_statement, args)
+    except Exception as e:
+        print(f"[ERROR] EXPLAIN da consulta lenta {fingerprint}: {e}")
+        plan = {'error': str(e)}
+    with _lock:
+        if fingerprint in _explains:
+            _explains[fingerprint] = plan
+
+
+def record_slow_query(sql_statement, normalized_sql, args, duration):
+    """
+    Registra um comando se a duração passar do limite configurado
+
+    Args:
+        sql_statement (str): Comando executado
+        normalized_sql (str): Comando normalizado (ver normalize_sql)
+        args (tuple | dict | None): Parâmetros do comando
+        duration (float): Duração em segundos
+    """
+    threshold = Config.SLOW_QUERY_THRESHOLD_MS
+    duration_ms = duration * 1000
+    if not threshold or duration_ms < threshold:
+        return
+
+    fingerprint = sql_fingerprint(normalized_sql)
+    sample = {
+        'fingerprint': fingerprint,
+        'statement': normalized_sql,
+        'params': redact_params(args),
+        'duration_ms': round(duration_ms, 1),
+        'endpoint': _current_endpoint(),
+        'at': datetime.now(),
+    }
+    print(f"[WARNING] Consulta lenta ({sample['duration_ms']} ms) em {sample['endpoint'] or '-'}: "
+          f"[{fingerprint}] {normalized_sql[:300]} params={sample['params']}")
+
+    run_explain = False
+    with _lock:
+        _samples.append(sample)
+        if Config.SLOW_QUERY_EXPLAIN and fingerprint not in _explains and _is_explainable(sql_statement):
+            _explains[fingerprint] = None
+            run_explain = True
+
+    if run_explain:
+        if isinstance(args, list):
+            args = tuple(args)
+        _explain_executor.submit(_capture_explain, fingerprint, sql_statement, args)
+
+
+def get_slow_queries(limit=None):
+    """
+    Retorna as amostras mais recentes e os planos capturados
+
+    Args:
+        limit (int, optional): Quantidade máxima de amostras
+
+    Returns:
+        dict: {'samples': [...] (mais recentes primeiro),
+               'explains': {fingerprint: plano}}
+    """
+    with _lock:
+        samples = list(reversed(_samples))
+        explains = {fingerprint: plan for fingerprint, plan in _explains.items() if plan is not None}
+    if limit:
+        samples = samples[:limit]
+    return {'samples': samples, 'explains': explains}
+
+
+def clear_slow_queries():
+    """Descarta as amostras e os planos guardados"""
+    with _lock:
+        _samples.clear()
+        _explains.clear()
@@ -0,0 +1,94 @@
+"""
+Helpers para leitura de planilhas (CSV/XLSX) enviadas em importações
+"""
+import csv
+import io
+import unicodedata
+
+ALLOWED_IMPORT_EXTENSIONS = {'csv', 'xlsx'}
+
+
+def normalize_header(value):
+    """
+    Normaliza o nome de uma coluna: minúsculas, sem acentos e com '_' no lugar de espaços
+
+    Args:
+        value: Valor do cabeçalho
+
+    Returns:
+        str: Nome normalizado
+    """
+    text = unicodedata.normalize('NFKD', str(value or '')).encode('ascii', 'ignore').decode()
+    return text.strip().lower().replace(' ', '_')
+
+
+def iter_spreadsheet_rows(file, aliases=None):
+    """
+    Lê uma planilha linha a linha, sem carregar o arquivo inteiro em memória
+
+    CSV é lido direto do stream (delimitador ',' ou ';' detectado pelo
+    cabeçalho). XLSX depende do pacote opcional openpyxl em modo read-only.
+
+    Args:
+        file: FileStorage object do Flask
+        aliases (dict, optional): Mapa {nome_normalizado: nome_do_campo}
+
+    Returns:
+        generator: Tuplas (número da linha na planilha, dict {campo: valor})
+
+    Raises:
+        ValueError: Se o arquivo for inválido ou o formato não suportado
+    """
+    if not file or not file.filename or '.' not in file.filename:
+        raise ValueError("Arquivo inválido")
+
+    ext = file.filename.rsplit('.', 1)[1].lower()
+    if ext not in ALLOWED_IMPORT_EXTENSIONS:
+        raise ValueError("Formato não suportado. Use CSV ou XLSX")
+
+    rows = _iter_csv(file) if ext == 'csv' else _iter_xlsx(file)
+    first = next(rows, None)
+    if first is None or not any(str(v).strip() for v in first[1] if v is not None):
+        raise ValueError("Planilha vazia ou sem cabeçalho")
+
+    aliases = aliases or {}
+    header = [aliases.get(normalize_header(v), normalize_header(v)) for v in first[1]]
+    return _iter_records(header, rows)
+
+
+def _iter_records(header, rows):
+    for line_number, values in rows:
+        if not any(str(v).strip() for v in values if v is not None):
+            continue
+        row = {}
+        for key, value in zip(header, values):
+            if key:
+                row[key] = str(value).strip() if value is not None else ''
+        yield line_number, row
+
+
+def _iter_csv(file):
+    stream = io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
+    first_line = stream.readline()
+    delimiter = ';' if first_line.count(';') > first_line.count(',') else ','
+    yield 1, next(csv.reader([first_line], delimiter=delimiter), [])
+    for index, values in enumerate(csv.reader(stream, delimiter=delimiter), start=2):
+        yield index, values
+
+
+def _iter_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Importação de XLSX requer o pacote openpyxl")
+    return _iter_xlsx_rows(load_workbook, file)
+
+
+def _iter_xlsx_rows(load_workbook, file):
+    workbook = load_workbook(file.stream, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        for index, values in enumerate(sheet.iter_rows(values_only=True), start=1):
+            yield index, list(values)
+    finally:
+        workbook.close()